@@ -0,0 +1,33 @@
+# assets.py  – logo / stylesheet loading shared by every page
+"""Static assets, read and fingerprinted once per process
+
+* `static_url("logo.png")` → "app/static/logo.png?v=<hash>"
+  Files in `static/` are served by Streamlit itself
+  (`server.enableStaticServing` in .streamlit/config.toml), so the
+  browser downloads the logo once and revalidates it with an ETag
+  instead of receiving it base64‑inlined on every rerun.  The content
+  hash changes the URL whenever the file does.
+* `read_text("style/style.css")` → file contents, read once.
+"""
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+STATIC_DIR = ROOT / "static"
+STATIC_ROUTE = "app/static"
+
+
+@lru_cache(maxsize=None)
+def static_url(name: str) -> str:
+    """Cache‑busting URL for a file in `static/`."""
+    digest = hashlib.sha1((STATIC_DIR / name).read_bytes()).hexdigest()[:10]
+    return f"{STATIC_ROUTE}/{name}?v={digest}"
+
+
+@lru_cache(maxsize=None)
+def read_text(path: str) -> str:
+    """Contents of a repo file (path relative to the repo root)."""
+    return (ROOT / path).read_text(encoding="utf-8")
@@ -0,0 +1,87 @@
+# auth.py  – password hashing on a bounded worker pool
+"""bcrypt hashing / verification off the Streamlit script thread
+
+    from auth import hash_password, verify_password
+
+    hashed = hash_password(password)
+    ok, new_hash = verify_password(password, stored_hash)
+    if ok and new_hash:           # cost changed → store the upgraded hash
+        ...
+
+Pass `stored_hash=None` for an unknown user: the password is checked
+against a dummy hash of the same cost, so a failed sign‑in takes as long
+whether or not the account exists.
+
+bcrypt releases the GIL, so the work runs on a small per‑process thread
+pool: at most `auth_workers` hashes run at once however many users sign
+in together, and everything else (page reruns, DB queries) keeps its
+share of the CPU.  Fetch the stored hash and release the DB connection
+*before* calling `verify_password`.
+
+Secrets (optional)
+
+* `bcrypt_rounds`  cost factor for new hashes (default 12)
+* `auth_workers`   concurrent hashes per process (default: CPU count, ≤ 4)
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import bcrypt
+import streamlit as st
+
+DEFAULT_BCRYPT_ROUNDS = 12
+DEFAULT_AUTH_WORKERS = min(4, os.cpu_count() or 1)
+
+
+@st.cache_resource
+def _executor() -> ThreadPoolExecutor:
+    workers = int(st.secrets.get("auth_workers", DEFAULT_AUTH_WORKERS))
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+
+def bcrypt_rounds() -> int:
+    return int(st.secrets.get("bcrypt_rounds", DEFAULT_BCRYPT_ROUNDS))
+
+
+def hash_rounds(hashed: str) -> Optional[int]:
+    """Cost factor encoded in a "$2b$12$..." hash, or None if unparsable."""
+    parts = hashed.split("$")
+    return int(parts[2]) if len(parts) > 3 and parts[2].isdigit() else None
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+
+
+@lru_cache(maxsize=4)
+def _dummy_hash(rounds: int) -> str:
+    return _hash(os.urandom(16).hex(), rounds)
+
+
+def _verify(password: str, hashed: Optional[str], rounds: int) -> Tuple[bool, Optional[str]]:
+    if hashed is None:          # unknown user: same work, never matches
+        bcrypt.checkpw(password.encode(), _dummy_hash(rounds).encode())
+        return False, None
+    try:
+        ok = bcrypt.checkpw(password.encode(), hashed.encode())
+    except ValueError:          # not a bcrypt hash
+        return False, None
+    if ok and hash_rounds(hashed) != rounds:
+        return True, _hash(password, rounds)
+    return ok, None
+
+
+def hash_password(password: str) -> str:
+    """bcrypt hash of `password` at the configured cost."""
+    return _executor().submit(_hash, password, bcrypt_rounds()).result()
+
+
+def verify_password(password: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """(matches, new_hash).  `new_hash` is set when the password matched but
+    `hashed` used a different cost than configured – store it in place of
+    the old one.  `hashed=None` (no such user) always fails in constant time."""
+    return _executor().submit(_verify, password, hashed, bcrypt_rounds()).result()
@@ -3,7 +3,7 @@
 
 Call
 -----
-    schedule, sem_credits, df = build_plan(
+    schedule, sem_credits, plan = build_plan(
         catalog_csv=Path(".../my_major.csv"),
         ap_scores={"Calculus BC":5, "Chemistry":4},
         min_cr=12,
@@ -15,38 +15,111 @@ Returned values
 ---------------
 * **schedule**     list[list[internal_course_id]]
 * **sem_credits**  list[int] total credits per term
-* **df**            pretty DataFrame ready for Streamlit
-
-The module rebuilds all lookup dicts every time you load a new catalog,
-so one import works for any major.
+* **plan**         DataFrame, one row per scheduled course (`PLAN_COLUMNS`:
+                   0‑based Semester, Course ID, Course Code, Course Name,
+                   Credits, SQI), in term order
+
+`catalog_csv` may also be a `Catalog` returned by `load_catalog`.  A
+`Catalog` owns its lookup dicts and prerequisite graph and is never
+mutated after loading, so one import works for any major and plans for
+different majors can be built concurrently from separate threads.
+
+Parsed catalogs are kept in a process‑wide LRU cache (`get_catalog`)
+keyed by CSV path and invalidated when the file's mtime or size changes.
+Finished plans are memoised too (`PLAN_CACHE_SIZE`), keyed by the
+catalog's content hash, the courses the AP profile grants, the credit
+bounds and the mode – `build_plan` is deterministic in exactly those.
+
+Plan library
+------------
+Common configurations (`LIBRARY_AP_PROFILES` × `LIBRARY_CREDIT_WINDOWS`
+× `LIBRARY_MODES` for every `*_courses.csv`) are precomputed offline
+into `PLAN_LIBRARY`, which `build_plan` consults before optimising:
+
+    python course_scheduler.py --build-library [--jobs N] [--out PATH]
+
+Entries are keyed like the memo plus `optimiser_digest()` – the
+library format version and a hash of this module's source – so editing
+a catalog or the scheduler simply stops old entries matching until the
+library is rebuilt.  The Four‑Year Plan page calls `plan_library()` at
+import, so it is loaded once per process rather than on the first plan.
 """
 from __future__ import annotations
 
 import pandas as pd
 import networkx as nx
+import bisect
+import functools
+import gzip
+import hashlib
+import io
+import json
+import operator
+import os
 import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
 from copy import deepcopy
 
 # Constants
-DATA_DIR = Path("4_Year_input_Data")
-AP_CREDIT_CSV = "4_Year_input_Data/rutgers_ap_credits.csv"
+DATA_DIR = Path(__file__).resolve().parent / "4_Year_input_Data"
+AP_CREDIT_CSV = DATA_DIR / "rutgers_ap_credits.csv"
 COURSE_RE = re.compile(r"(\d{3}:[0-9xX]{3})", re.IGNORECASE)
+SEASON_SPLIT_RE = re.compile(r"[^a-z]+")
+OR_RE = re.compile(r"\s+or\s+", re.IGNORECASE)
+AND_RE = re.compile(r"\s+and\s+|[,;]", re.IGNORECASE)
 
 DEFAULT_MIN_CR = 12
 DEFAULT_MAX_CR = 18
 ELECTIVE_START_SEM = 0
 SPRINKLE_LAST = 2
 NO_MIN_FLOOR_AFTER = 6
-
-# Global variables
-cat: pd.DataFrame | None = None
-credits_of: Dict[str, int] = {}
-sqi_of: Dict[str, float] = {}
-display_of: Dict[str, str] = {}
-offered_of: Dict[str, str] = {}
-prereq_of: Dict[str, str] = {}
+CATALOG_CACHE_SIZE = 16   # every major in DATA_DIR stays warm
+PLAN_CACHE_SIZE = 512
+PLAN_LIBRARY = DATA_DIR / "plan_library.json.gz"
+PLAN_LIBRARY_VERSION = 2
+LIBRARY_AP_PROFILES = (
+    {},
+    {"Calculus AB": 5},
+    {"Calculus BC": 4},
+    {"Calculus BC": 5},
+    {"Calculus BC": 5, "Chemistry": 5},
+    {"Calculus BC": 5, "Physics C: Mechanics": 5},
+    {"Calculus BC": 5, "Chemistry": 5, "Physics C: Mechanics": 5},
+    {"Calculus BC": 5, "Chemistry": 5, "Physics C: Mechanics": 5, "Physics C: E&M": 5},
+    {"Calculus BC": 5, "Computer Science A": 5},
+    {"Calculus BC": 5, "Chemistry": 5, "English Language and Composition": 5},
+)
+LIBRARY_CREDIT_WINDOWS = ((12, 18), (12, 17), (12, 16), (15, 18), (12, 21))
+LIBRARY_MODES = ("var", "avg")
+PLAN_COLUMNS = ["Semester", "Course ID", "Course Code", "Course Name", "Credits", "SQI"]
+
+# Catalog
+
+@dataclass(frozen=True)
+class Catalog:
+    """Parsed catalog: lookup dicts keyed by internal id plus the prereq DAG.
+
+    Treat every field as read-only; the same instance may be shared by
+    concurrent plan builds.
+    """
+    cat: pd.DataFrame
+    credits_of: Dict[str, int]
+    sqi_of: Dict[str, float]
+    display_of: Dict[str, str]
+    name_of: Dict[str, str]
+    seasons_of: Dict[str, frozenset[str]]   # empty set = any term
+    prereq_of: Dict[str, str]
+    codes_of: Dict[str, List[str]]   # display code -> internal ids
+    graph: nx.DiGraph                # hard prerequisites only
+    order: Tuple[str, ...]           # topological order of `graph`
+    bit_of: Dict[str, int]           # display code -> completion bit
+    dnf_of: Dict[str, Tuple[int, ...]]   # internal id -> prereq clause masks
+    catalog_mask: int                # bits of codes offered in this catalog
+    fingerprint: str                 # sha1 of the CSV bytes
 
 # Load Data
 
@@ -55,106 +128,340 @@ def _norm(code: str) -> str:
     return m.group(1).upper() if m else str(code).strip().upper()
 
 
-def load_catalog(csv_path: Path) -> None:
-    """Load a catalog CSV and rebuild global lookup dicts."""
-    global cat, credits_of, sqi_of, display_of, offered_of, prereq_of
+def _mask(displays: Iterable[str], bit_of: Dict[str, int]) -> int:
+    """OR of the completion bits of `displays`; unknown codes are ignored."""
+    m = 0
+    for d in displays:
+        if d in bit_of:
+            m |= 1 << bit_of[d]
+    return m
 
-    raw = pd.read_csv(csv_path, dtype=str).fillna("")
-    rows, seen = [], {}
-    for _, r in raw.iterrows():
-        disp = r["Course Code"].strip().upper()
-        if not disp:
-            continue
-        seen[disp] = seen.get(disp, 0) + 1
-        internal = disp if seen[disp] == 1 else f"{disp}#{seen[disp]}"
-        cr_match = re.search(r"(\d+)", r["Credits"])
-        credits = int(cr_match.group(1)) if cr_match else None
-        try:
-            sqi = float(r.get("SQI", "").strip()) if r.get("SQI", "").strip() else 3.0
-        except ValueError:
-            sqi = 3.0
-        rows.append({
-            "Int": internal,
-            "Disp": disp,
-            "Name": r.get("Course Name", "").strip(),
-            "Credits": credits,
-            "Prereq": r.get("Prerequisites", ""),
-            "Offered": r.get("Semester Offered", "").lower(),
-            "SQI": sqi,
-        })
-
-    cat = pd.DataFrame(rows).set_index("Int")
-    credits_of = cat["Credits"].to_dict()
-    sqi_of = cat["SQI"].to_dict()
+
+def _col(raw: pd.DataFrame, name: str) -> pd.Series:
+    return raw[name] if name in raw.columns else pd.Series("", index=raw.index)
+
+
+def _seasons(offered: str) -> frozenset[str]:
+    """'Spring, Fall' -> {'spring', 'fall'}; empty means offered every term."""
+    return frozenset(t for t in SEASON_SPLIT_RE.split(offered) if t and t != "nan")
+
+
+def load_catalog(csv_path: Path) -> Catalog:
+    """Load a catalog CSV into a self-contained `Catalog`.
+
+    Parsing is column-wise; missing optional columns read as empty.
+    """
+    data = Path(csv_path).read_bytes()
+    raw = pd.read_csv(io.BytesIO(data), dtype=str).fillna("")
+    disp = _col(raw, "Course Code").str.strip().str.upper()
+    keep = disp != ""
+    raw, disp = raw[keep], disp[keep]
+
+    # repeated codes become CODE#2, CODE#3, ... in file order
+    nth = disp.groupby(disp).cumcount() + 1
+    internal = disp.where(nth == 1, disp + "#" + nth.astype(str))
+
+    credits = pd.to_numeric(_col(raw, "Credits").str.extract(r"(\d+)", expand=False))
+    if not credits.isna().any():
+        credits = credits.astype("int64")
+    elif credits.isna().all():
+        credits = pd.Series(None, index=credits.index, dtype=object)
+
+    sqi_txt = _col(raw, "SQI").str.strip()
+    sqi = pd.to_numeric(sqi_txt, errors="coerce").fillna(3.0)
+
+    cat = pd.DataFrame({
+        "Int": internal.to_numpy(),
+        "Disp": disp.to_numpy(),
+        "Name": _col(raw, "Course Name").str.strip().to_numpy(),
+        "Credits": credits.to_numpy(),
+        "Prereq": _col(raw, "Prerequisites").to_numpy(),
+        "Offered": _col(raw, "Semester Offered").str.lower().to_numpy(),
+        "SQI": sqi.astype(float).to_numpy(),
+    }).set_index("Int")
     display_of = cat["Disp"].to_dict()
-    offered_of = cat["Offered"].to_dict()
     prereq_of = cat["Prereq"].to_dict()
+    codes_of: Dict[str, List[str]] = {}
+    for ic, d in display_of.items():
+        codes_of.setdefault(d, []).append(ic)
+    # copies of one display code share a bit: taking any copy satisfies it;
+    # codes only named in prerequisites get bits after the catalog's own
+    bit_of = {d: i for i, d in enumerate(codes_of)}
+    dnf_of: Dict[str, Tuple[int, ...]] = {}
+    for ic, expr in prereq_of.items():
+        clauses = parse_prereq(expr)
+        for d in (d for clause in clauses for d in clause):
+            bit_of.setdefault(d, len(bit_of))
+        dnf_of[ic] = tuple(_mask(clause, bit_of) for clause in clauses)
+    catalog_mask = (1 << len(codes_of)) - 1
+    graph = build_graph(codes_of, _resolve(dnf_of, catalog_mask, 0))
+    return Catalog(
+        cat=cat,
+        credits_of=cat["Credits"].to_dict(),
+        sqi_of=cat["SQI"].to_dict(),
+        display_of=display_of,
+        name_of=cat["Name"].to_dict(),
+        seasons_of={ic: _seasons(o) for ic, o in cat["Offered"].items()},
+        prereq_of=prereq_of,
+        codes_of=codes_of,
+        graph=graph,
+        order=tuple(nx.topological_sort(graph)),
+        bit_of=bit_of,
+        dnf_of=dnf_of,
+        catalog_mask=catalog_mask,
+        fingerprint=hashlib.sha1(data).hexdigest(),
+    )
 
-# AP Credit Handler Functions
-ap_df = pd.read_csv("./"+AP_CREDIT_CSV, dtype=str)
-ap_df["Score"] = pd.to_numeric(ap_df["Score"], errors="coerce")
+# Catalog Cache
+_catalog_cache: OrderedDict[str, Tuple[Tuple[int, int], Catalog]] = OrderedDict()
+_catalog_lock = threading.Lock()
+_catalog_stats = {"hits": 0, "misses": 0}
+
+
+def get_catalog(csv_path: Path) -> Catalog:
+    """Return the parsed catalog for `csv_path`, reusing the cached copy
+    while the file's mtime and size are unchanged."""
+    path = str(Path(csv_path).resolve())
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _catalog_lock:
+        entry = _catalog_cache.get(path)
+        if entry is not None and entry[0] == stamp:
+            _catalog_cache.move_to_end(path)
+            _catalog_stats["hits"] += 1
+            return entry[1]
+        _catalog_stats["misses"] += 1
+
+    catalog = load_catalog(path)   # parse outside the lock
+    with _catalog_lock:
+        _catalog_cache[path] = (stamp, catalog)
+        _catalog_cache.move_to_end(path)
+        while len(_catalog_cache) > CATALOG_CACHE_SIZE:
+            _catalog_cache.popitem(last=False)
+    return catalog
+
+
+def catalog_cache_info() -> Dict[str, int]:
+    """Hit/miss counters and current size of the catalog cache."""
+    with _catalog_lock:
+        return {**_catalog_stats, "size": len(_catalog_cache),
+                "maxsize": CATALOG_CACHE_SIZE}
+
+
+def clear_catalog_cache() -> None:
+    with _catalog_lock:
+        _catalog_cache.clear()
+        _catalog_stats.update(hits=0, misses=0)
 
-def ap_fulfilled(ap_scores: Dict[str, int]) -> set[str]:
+# AP Credit Handler Functions
+@functools.lru_cache(maxsize=None)
+def ap_table() -> pd.DataFrame:
+    """The AP credit table, read on first use and shared afterwards.
+
+    Callers must not modify the returned frame.
+    """
+    ap_df = pd.read_csv(AP_CREDIT_CSV, dtype=str)
+    ap_df["Score"] = pd.to_numeric(ap_df["Score"], errors="coerce")
+    return ap_df
+
+
+@functools.lru_cache(maxsize=None)
+def ap_exams() -> Tuple[str, ...]:
+    """Sorted AP exam names, for exam pickers."""
+    return tuple(sorted(ap_table()["AP Exam"].unique()))
+
+
+@functools.lru_cache(maxsize=None)
+def _ap_index() -> Dict[str, Tuple[Tuple[float, ...], Tuple[frozenset[str], ...]]]:
+    """exam (lower‑cased) -> (ascending min scores, courses granted at each).
+
+    The granted sets are cumulative, so the entry for the highest
+    threshold at or below a score is everything that score earns.
+    """
+    grants: Dict[str, Dict[float, set[str]]] = {}
+    for exam, score, granted in ap_table()[["AP Exam", "Score", "Rutgers Course(s) Granted"]] \
+            .dropna(subset=["Score"]).itertuples(index=False):
+        courses = {_norm(c) for c in str(granted).split("&")}
+        grants.setdefault(str(exam).lower(), {}).setdefault(score, set()).update(courses)
+
+    index = {}
+    for exam, by_score in grants.items():
+        scores = tuple(sorted(by_score))
+        acc: set[str] = set()
+        granted_at = []
+        for sc in scores:
+            acc |= by_score[sc]
+            granted_at.append(frozenset(acc))
+        index[exam] = (scores, tuple(granted_at))
+    return index
+
+
+@functools.lru_cache(maxsize=1024)
+def _ap_fulfilled(profile: frozenset[Tuple[str, int]]) -> frozenset[str]:
+    index = _ap_index()
     done: set[str] = set()
-    for exam, sc in ap_scores.items():
-        rows = ap_df[(ap_df["AP Exam"].str.lower() == exam.lower()) & (ap_df["Score"] <= sc)]
-        for _, row in rows.iterrows():
-            for course in str(row["Rutgers Course(s) Granted"]).split("&"):
-                done.add(_norm(course))
-    return done
+    for exam, sc in profile:
+        scores, granted_at = index.get(exam.lower(), ((), ()))
+        i = bisect.bisect_right(scores, sc)
+        if i:
+            done |= granted_at[i - 1]
+    return frozenset(done)
+
+
+def ap_fulfilled(ap_scores: Dict[str, int]) -> frozenset[str]:
+    """Normalised course codes earned by an AP profile ({exam: score}).
+
+    Results are memoised per profile; many students share the same one.
+    """
+    return _ap_fulfilled(frozenset(ap_scores.items()))
+
+# Prerequisite Expressions
+
+def parse_prereq(expr: str) -> List[List[str]]:
+    """'A and B or C' -> [['A', 'B'], ['C']]: DNF over normalised codes.
+
+    ``and`` binds tighter than ``or``; ``,`` and ``;`` read as ``and``.
+    """
+    clauses = []
+    for part in OR_RE.split(expr.strip()):
+        clause = [d for d in (_norm(t) for t in AND_RE.split(part)) if d]
+        if clause:
+            clauses.append(clause)
+    return clauses
+
+
+def _minimal(clauses: Iterable[int]) -> Tuple[int, ...]:
+    """Drop clauses implied by a smaller one; () means always satisfied."""
+    kept: List[int] = []
+    for m in sorted(set(clauses), key=int.bit_count):
+        if not m:
+            return ()
+        if not any(k & m == k for k in kept):
+            kept.append(m)
+    return tuple(kept)
+
+
+def _resolve(dnf_of: Dict[str, Tuple[int, ...]], catalog_mask: int,
+             done: int) -> Dict[str, Tuple[int, ...]]:
+    """Specialise compiled prerequisites to a student's starting mask.
+
+    A clause naming a course outside the catalog is only usable if `done`
+    (AP credit) already covers it.  When no clause is usable, the clauses
+    missing the fewest outside courses are kept with those courses assumed
+    satisfied by placement.  A clause made only of outside courses is never
+    kept that way – it would waive every catalog course of the others – so
+    only a prerequisite with no catalog course in any clause is dropped.
+    """
+    outside = ~catalog_mask & ~done
+    reqs = {}
+    for ic, clauses in dnf_of.items():
+        usable = [m for m in clauses if not m & outside]
+        if not usable:
+            partial = [m for m in clauses if m & catalog_mask]
+            if partial:
+                fewest = min((m & outside).bit_count() for m in partial)
+                usable = [m & catalog_mask for m in partial
+                          if (m & outside).bit_count() == fewest]
+        reqs[ic] = _minimal(m & ~done for m in usable)
+    return reqs
+
+
+def _met(clauses: Tuple[int, ...], done: int) -> bool:
+    """True when some clause of a resolved prerequisite lies inside `done`."""
+    return not clauses or any(not m & ~done for m in clauses)
+
+
+def unmet_prereqs(catalog: Catalog, fulfilled_disp: frozenset[str],
+                  schedule: List[List[str]]) -> List[Tuple[int, str]]:
+    """(semester, internal id) of every scheduled course for which no
+    clause has all its catalog courses taken in earlier terms or granted.
+
+    Checks the raw clauses, independently of `_resolve`: clauses made only
+    of outside courses count only when AP credit covers them.  Empty for
+    every plan the optimiser builds.
+    """
+    done = _mask(fulfilled_disp, catalog.bit_of)
+    outside = ~catalog.catalog_mask & ~done
+    bad = []
+    for sem, term in enumerate(schedule):
+        for c in term:
+            checkable = [m for m in catalog.dnf_of[c]
+                         if m & catalog.catalog_mask or not m & outside]
+            if checkable and not any(not m & catalog.catalog_mask & ~done for m in checkable):
+                bad.append((sem, c))
+        done |= _mask((catalog.display_of[c] for c in term), catalog.bit_of)
+    return bad
+
+
+def _requirements(catalog: Catalog, fulfilled_disp: frozenset[str]
+                  ) -> Tuple[Dict[str, Tuple[int, ...]], int]:
+    """Resolved prerequisites and starting completion mask for one plan."""
+    done = _mask(fulfilled_disp, catalog.bit_of)
+    return _resolve(catalog.dnf_of, catalog.catalog_mask, done), done
 
 # Prerequisite Graph Builder
 
-def build_graph() -> nx.DiGraph:
+def build_graph(codes_of: Dict[str, List[str]],
+                reqs: Dict[str, Tuple[int, ...]]) -> nx.DiGraph:
+    """Return the frozen DAG of hard prerequisites for one catalog.
+
+    Only courses required by every clause become edges, so alternatives
+    ("A or B") never add edges.  The graph is built once per `Catalog`
+    and only orders courses; eligibility is checked with `_met`.
+    """
+    displays = list(codes_of)   # catalog bits come first in bit_of
     G = nx.DiGraph()
-    for code in cat.index:
+    for code, clauses in reqs.items():
         G.add_node(code)
-        for token in re.split(r",| and | or |;", prereq_of[code]):
-            p_disp = _norm(token)
-            for ic, d in display_of.items():
-                if d == p_disp:
-                    G.add_edge(ic, code)
-    return G
+        hard = functools.reduce(operator.and_, clauses) if clauses else 0
+        while hard:
+            low = hard & -hard
+            for ic in codes_of[displays[low.bit_length() - 1]]:
+                G.add_edge(ic, code)
+            hard ^= low
+    return nx.freeze(G)
 
 # Base Schedule Builder
 
-def _baseline(ap_scores: Dict[str, int], min_cr: int, max_cr: int,
-              semesters: int = 8):
-    fulfilled_disp = ap_fulfilled(ap_scores)
-    G = build_graph()
+def _baseline(catalog: Catalog, fulfilled_disp: frozenset[str],
+              reqs: Dict[str, Tuple[int, ...]], done0: int, min_cr: int,
+              max_cr: int, semesters: int = 8):
+    credits_of, sqi_of = catalog.credits_of, catalog.sqi_of
+    display_of, seasons_of = catalog.display_of, catalog.seasons_of
+    bit = {c: 1 << catalog.bit_of[display_of[c]] for c in display_of}
 
     core, elect = [], []
-    for c in nx.topological_sort(G):
+    for c in catalog.order:
         if display_of[c] in fulfilled_disp or credits_of[c] is None:
             continue
-        (elect if "ELECTIVE" in cat.loc[c, "Name"].upper() else core).append(c)
+        (elect if "ELECTIVE" in catalog.name_of[c].upper() else core).append(c)
     core.sort(key=lambda x: sqi_of[x], reverse=True)
     elect.sort(key=lambda x: sqi_of[x], reverse=True)
 
     sched: List[List[str]] = [[] for _ in range(semesters)]
     sem_cr = [0] * semesters
-    completed_disp = set(fulfilled_disp)
+    completed = done0
 
     def met(code, comp):
-        return all(display_of[p] in comp for p in G.predecessors(code))
+        return _met(reqs[code], comp)
 
     def offered(code, season):
-        return offered_of.get(code, "") in ("", "nan") or season in offered_of[code]
+        return not seasons_of[code] or season in seasons_of[code]
 
     for sem in range(semesters):
         season = "fall" if sem % 2 == 0 else "spring"
-        comp = completed_disp.copy()
+        comp = completed
         for c in core[:]:
             if met(c, comp) and offered(c, season) and sem_cr[sem] + credits_of[c] <= max_cr:
-                sched[sem].append(c); sem_cr[sem] += credits_of[c]; completed_disp.add(display_of[c]); core.remove(c)
+                sched[sem].append(c); sem_cr[sem] += credits_of[c]; completed |= bit[c]; core.remove(c)
         if sem >= ELECTIVE_START_SEM:
             for c in elect[:]:
                 if met(c, comp) and offered(c, season) and sem_cr[sem] + credits_of[c] <= max_cr:
-                    sched[sem].append(c); sem_cr[sem] += credits_of[c]; completed_disp.add(display_of[c]); elect.remove(c)
+                    sched[sem].append(c); sem_cr[sem] += credits_of[c]; completed |= bit[c]; elect.remove(c)
         if sem >= ELECTIVE_START_SEM and sem_cr[sem] < min_cr:
             for c in elect[:]:
                 if met(c, comp) and offered(c, season) and min_cr <= sem_cr[sem] + credits_of[c] <= max_cr:
-                    sched[sem].append(c); sem_cr[sem] += credits_of[c]; completed_disp.add(display_of[c]); elect.remove(c)
+                    sched[sem].append(c); sem_cr[sem] += credits_of[c]; completed |= bit[c]; elect.remove(c)
                     break
 
     # sprinkle leftovers
@@ -162,79 +469,127 @@ def _baseline(ap_scores: Dict[str, int], min_cr: int, max_cr: int,
     for c in sorted(leftovers, key=lambda x: sqi_of[x], reverse=True):
         for sem in range(semesters - SPRINKLE_LAST, semesters):
             season = "fall" if sem % 2 == 0 else "spring"
-            comp = {display_of[x] for s in sched[:sem] for x in s} | fulfilled_disp
+            comp = done0
+            for x in (x for s in sched[:sem] for x in s):
+                comp |= bit[x]
             if met(c, comp) and offered(c, season) and min_cr <= sem_cr[sem] + credits_of[c] <= max_cr:
                 sched[sem].append(c); sem_cr[sem] += credits_of[c]; break
 
-    return sched, sem_cr, G, fulfilled_disp
+    return sched, sem_cr
 
 #  SQI hill‑climb Optimizer 
 
-def _hill_climb(schedule: List[List[str]], sem_cr: List[int], G: nx.DiGraph,
-                fulfilled_disp: set[str], min_cr: int, max_cr: int,
-                mode: str = "avg", max_iters: int = 800):
-    """Greedy hill‑climb; `mode` = 'avg' or 'var'."""
+def _hill_climb(catalog: Catalog, schedule: List[List[str]], sem_cr: List[int],
+                reqs: Dict[str, Tuple[int, ...]], done0: int, min_cr: int,
+                max_cr: int, mode: str = "avg", max_iters: int = 800):
+    """Greedy hill‑climb; `mode` = 'avg' or 'var'.
+
+    Per-term SQI sums / course counts and the credit sum of squares are
+    kept up to date on every move, so a candidate move or swap is scored
+    from the two terms it touches without applying it first.  Completion
+    is tracked as bitmasks: ``done_before[s]`` holds every course finished
+    before term `s`, so a prerequisite check is one mask test.
+    """
+    if mode not in ("avg", "var"):
+        raise ValueError("mode must be 'avg' or 'var'")
+    credits_of, sqi_of = catalog.credits_of, catalog.sqi_of
+    seasons_of, name_of = catalog.seasons_of, catalog.name_of
+    bit_of = catalog.bit_of
+
+    # running totals
+    sqi_sum = [sum(sqi_of[c] for c in t) for t in schedule]
+    n_courses = [len(t) for t in schedule]
+    avg_total = sum(s / n for s, n in zip(sqi_sum, n_courses) if n)
+    n_terms = sum(1 for n in n_courses if n)
+    cr_sq = sum(c * c for c in sem_cr)
+    cr_mean_sq = sum(sem_cr) ** 2 / len(sem_cr)   # moves never change total credits
+
+    # completion bitmasks
+    disp_bit = {c: 1 << bit_of[catalog.display_of[c]] for t in schedule for c in t}
+    term_mask = [0] * len(schedule)
+    done_before = [0] * len(schedule)
+
+    def refresh_masks(first, sems):
+        for s in sems:
+            m = 0
+            for c in schedule[s]:
+                m |= disp_bit[c]
+            term_mask[s] = m
+        done = done_before[first - 1] | term_mask[first - 1] if first else done0
+        for s in range(first, len(schedule)):
+            done_before[s] = done
+            done |= term_mask[s]
+
+    refresh_masks(0, range(len(schedule)))
 
     def has_floor(sem):
         return sem < NO_MIN_FLOOR_AFTER
 
-    def term_sqi(term):
-        return sum(sqi_of[c] for c in term) / len(term) if term else 0.0
-
-    def credit_var():
-        mu = sum(sem_cr) / len(sem_cr)
-        return sum((c - mu) ** 2 for c in sem_cr)
-
-    def score():
-        avgs = [term_sqi(t) for t in schedule if t]
-        avg_sqi = sum(avgs) / len(avgs)
+    def score_after(a, b, d_sqi=0.0, d_n=0, d_cr=0):
+        """Score once term `a` loses and term `b` gains (d_sqi, d_n, d_cr)."""
         if mode == "avg":
-            return avg_sqi
-        if mode == "var":
-            return -credit_var()  # maximise negative variance
-        raise ValueError("mode must be 'avg' or 'var'")
-
-    def met(code, comp):
-        return all(display_of[p] in comp for p in G.predecessors(code))
+            total, k = avg_total, n_terms
+            for s, sign in ((a, -1), (b, 1)):
+                if n_courses[s]:
+                    total -= sqi_sum[s] / n_courses[s]; k -= 1
+                n = n_courses[s] + sign * d_n
+                if n:
+                    total += (sqi_sum[s] + sign * d_sqi) / n; k += 1
+            return total / k
+        sq = cr_sq - sem_cr[a] ** 2 - sem_cr[b] ** 2 \
+            + (sem_cr[a] - d_cr) ** 2 + (sem_cr[b] + d_cr) ** 2
+        return -(sq - cr_mean_sq)  # maximise negative variance
+
+    def met(code, sem):
+        return _met(reqs[code], done_before[sem])
 
     def season_of(sem):
         return "fall" if sem % 2 == 0 else "spring"
 
-    def completed_before(sem):
-        return {display_of[x] for s in schedule[:sem] for x in s} | fulfilled_disp
-
     def can_insert(code, sem):
         if sem_cr[sem] + credits_of[code] > max_cr:
             return False
         if has_floor(sem) and sem_cr[sem] + credits_of[code] < min_cr:
             return False
-        return offered_of.get(code, "") in ("", "nan") or season_of(sem) in offered_of[code] and \
-               met(code, completed_before(sem))
+        return (not seasons_of[code] or season_of(sem) in seasons_of[code]) and \
+               met(code, sem)
 
     def can_remove(code, sem):
         return not (has_floor(sem) and sem_cr[sem] - credits_of[code] < min_cr)
 
     def do_move(code, src, dst):
+        nonlocal avg_total, n_terms, cr_sq
+        for s in (src, dst):
+            if n_courses[s]:
+                avg_total -= sqi_sum[s] / n_courses[s]; n_terms -= 1
+            cr_sq -= sem_cr[s] ** 2
         schedule[src].remove(code)
         schedule[dst].append(code)
         sem_cr[src] -= credits_of[code]
         sem_cr[dst] += credits_of[code]
-
-    best = score()
+        sqi_sum[src] -= sqi_of[code]; n_courses[src] -= 1
+        sqi_sum[dst] += sqi_of[code]; n_courses[dst] += 1
+        for s in (src, dst):
+            if n_courses[s]:
+                avg_total += sqi_sum[s] / n_courses[s]; n_terms += 1
+            cr_sq += sem_cr[s] ** 2
+        refresh_masks(min(src, dst) + 1, (src, dst))
+
+    best = score_after(0, 0)
     iters = 0
     while iters < max_iters:
         improved = False
         # single‑course forward moves
         for src in range(len(schedule) - 1):
             for code in schedule[src][:]:
-                if "ELECTIVE" not in cat.loc[code, "Name"].upper() or not can_remove(code, src):
+                if "ELECTIVE" not in name_of[code].upper() or not can_remove(code, src):
                     continue
                 for dst in range(src + 1, len(schedule)):
                     if can_insert(code, dst):
-                        do_move(code, src, dst)
-                        if score() > best:
-                            best = score(); improved = True; break
-                        do_move(code, dst, src)
+                        new = score_after(src, dst, sqi_of[code], 1, credits_of[code])
+                        if new > best:
+                            do_move(code, src, dst)
+                            best = new; improved = True; break
                 if improved:
                     break
             if improved:
@@ -246,16 +601,17 @@ def _hill_climb(schedule: List[List[str]], sem_cr: List[int], G: nx.DiGraph,
         for a in range(len(schedule)):
             for b in range(a + 1, len(schedule)):
                 for ca in schedule[a]:
-                    if "ELECTIVE" not in cat.loc[ca, "Name"].upper() or not can_remove(ca, a):
+                    if "ELECTIVE" not in name_of[ca].upper() or not can_remove(ca, a):
                         continue
                     for cb in schedule[b]:
-                        if "ELECTIVE" not in cat.loc[cb, "Name"].upper() or not can_remove(cb, b):
+                        if "ELECTIVE" not in name_of[cb].upper() or not can_remove(cb, b):
                             continue
                         if can_insert(ca, b) and can_insert(cb, a):
-                            do_move(ca, a, b); do_move(cb, b, a)
-                            if score() > best:
-                                best = score(); improved = True; break
-                            do_move(ca, b, a); do_move(cb, a, b)
+                            new = score_after(a, b, sqi_of[ca] - sqi_of[cb], 0,
+                                              credits_of[ca] - credits_of[cb])
+                            if new > best:
+                                do_move(ca, a, b); do_move(cb, b, a)
+                                best = new; improved = True; break
                     if improved:
                         break
                 if improved:
@@ -267,32 +623,181 @@ def _hill_climb(schedule: List[List[str]], sem_cr: List[int], G: nx.DiGraph,
         iters += 1
 
 # API
+_plan_cache: OrderedDict[tuple, Tuple[List[List[str]], List[int], pd.DataFrame]] = OrderedDict()
+_plan_lock = threading.Lock()
+_plan_stats = {"hits": 0, "misses": 0, "library_hits": 0}
+
 
-def to_df(schedule: List[List[str]]) -> pd.DataFrame:
-    max_len = max(len(s) for s in schedule)
-    cols: Dict[str, List[str]] = {}
-    for i, sem in enumerate(schedule, 1):
-        lines = [f"{display_of[c]} {cat.loc[c,'Name']} (" \
-                 f"{credits_of[c]} cr, SQI {sqi_of[c]:.2f})" for c in sem]
-        cols[f"Semester {i}"] = lines + [""] * (max_len - len(lines))
-    return pd.DataFrame(cols)
+def to_plan(catalog: Catalog, schedule: List[List[str]]) -> pd.DataFrame:
+    """One row per scheduled course, in term order (see `PLAN_COLUMNS`)."""
+    rows = [(sem, c, catalog.display_of[c], catalog.name_of[c],
+             catalog.credits_of[c], catalog.sqi_of[c])
+            for sem, term in enumerate(schedule) for c in term]
+    plan = pd.DataFrame(rows, columns=PLAN_COLUMNS)
+    return plan.astype({"Semester": int, "Credits": int, "SQI": float})
 
 
-def build_plan(catalog_csv: Path,
+def build_plan(catalog_csv: Path | Catalog,
                ap_scores: Dict[str, int],
                min_cr: int = DEFAULT_MIN_CR,
                max_cr: int = DEFAULT_MAX_CR,
                mode: str = "avg") -> Tuple[List[List[str]], List[int], pd.DataFrame]:
-    """Generate schedule, credits list, and DataFrame."""
-    load_catalog(catalog_csv)
-    sched, sem_cr, G, fulfilled = _baseline(ap_scores, min_cr, max_cr)
-    _hill_climb(sched, sem_cr, G, fulfilled, min_cr, max_cr, mode=mode)
-    return sched, sem_cr, to_df(sched)
-
-# --------------------------- demo ----------------------------
+    """Generate schedule, credits list, and plan DataFrame.
+
+    Results are memoised process‑wide and looked up in the precomputed
+    plan library before optimising; every call returns fresh copies.
+    """
+    catalog = catalog_csv if isinstance(catalog_csv, Catalog) else get_catalog(catalog_csv)
+    fulfilled = ap_fulfilled(ap_scores)
+    key = (catalog.fingerprint, fulfilled, int(min_cr), int(max_cr), mode)
+    with _plan_lock:
+        hit = _plan_cache.get(key)
+        if hit is not None:
+            _plan_cache.move_to_end(key)
+            _plan_stats["hits"] += 1
+            return deepcopy(hit)
+        _plan_stats["misses"] += 1
+
+    stored = plan_library().get((optimiser_digest(), *key))
+    if stored is not None:
+        sched = [list(term) for term in stored]
+        sem_cr = [sum(catalog.credits_of[c] for c in term) for term in sched]
+        with _plan_lock:
+            _plan_stats["library_hits"] += 1
+    else:
+        sched, sem_cr = _optimise(catalog, fulfilled, int(min_cr), int(max_cr), mode)
+    result = (sched, sem_cr, to_plan(catalog, sched))
+    with _plan_lock:
+        _plan_cache[key] = deepcopy(result)
+        _plan_cache.move_to_end(key)
+        while len(_plan_cache) > PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return result
+
+
+def _optimise(catalog: Catalog, fulfilled: frozenset[str], min_cr: int, max_cr: int,
+              mode: str) -> Tuple[List[List[str]], List[int]]:
+    """Baseline + hill climb, bypassing memo and library."""
+    reqs, done0 = _requirements(catalog, fulfilled)
+    sched, sem_cr = _baseline(catalog, fulfilled, reqs, done0, min_cr, max_cr)
+    _hill_climb(catalog, sched, sem_cr, reqs, done0, min_cr, max_cr, mode=mode)
+    return sched, sem_cr
+
+
+def plan_cache_info() -> Dict[str, int]:
+    """Hit/miss counters (misses include library hits) and memo size."""
+    with _plan_lock:
+        return {**_plan_stats, "size": len(_plan_cache), "maxsize": PLAN_CACHE_SIZE}
+
+
+def clear_plan_cache() -> None:
+    with _plan_lock:
+        _plan_cache.clear()
+        _plan_stats.update(hits=0, misses=0, library_hits=0)
+
+# Plan Library
+
+@functools.lru_cache(maxsize=None)
+def optimiser_digest() -> str:
+    """`PLAN_LIBRARY_VERSION` plus a hash of this module's source.
+
+    Stored in every library key, so plans computed by any other version of
+    the scheduler never match.  Line endings are normalised so a CRLF
+    checkout hashes the same.
+    """
+    src = Path(__file__).read_bytes().replace(b"\r\n", b"\n")
+    return f"{PLAN_LIBRARY_VERSION}:{hashlib.sha1(src).hexdigest()}"
+
+
+@functools.lru_cache(maxsize=None)
+def plan_library() -> Dict[tuple, Tuple[Tuple[str, ...], ...]]:
+    """Precomputed schedules from `PLAN_LIBRARY`, read once per process.
+
+    Keyed by `optimiser_digest()` followed by the plan memo key.  A missing
+    file, one in another format version, or entries written by another
+    optimiser yield no plans.
+    """
+    if not PLAN_LIBRARY.exists():
+        return {}
+    with gzip.open(PLAN_LIBRARY, "rt", encoding="utf-8") as f:
+        doc = json.load(f)
+    if doc.get("version") != PLAN_LIBRARY_VERSION:
+        return {}
+    current = optimiser_digest()
+    return {
+        (digest, fp, frozenset(granted), lo, hi, mode): tuple(tuple(term) for term in sched)
+        for digest, fp, granted, lo, hi, mode, sched in doc["plans"]
+        if digest == current
+    }
+
+
+def library_catalogs() -> List[Path]:
+    return sorted(DATA_DIR.glob("*_courses.csv"))
+
+
+def _library_entry(task: Tuple[str, Tuple[Tuple[str, int], ...], int, int, str]) -> list:
+    csv_path, profile, min_cr, max_cr, mode = task
+    catalog = get_catalog(Path(csv_path))
+    fulfilled = ap_fulfilled(dict(profile))
+    sched, _ = _optimise(catalog, fulfilled, min_cr, max_cr, mode)
+    unmet = unmet_prereqs(catalog, fulfilled, sched)
+    if unmet:
+        raise ValueError(f"{csv_path} {task[1:]}: prerequisites unmet for {unmet}")
+    return [optimiser_digest(), catalog.fingerprint, sorted(fulfilled),
+            min_cr, max_cr, mode, sched]
+
+
+def build_library(out: Path = PLAN_LIBRARY, jobs: int | None = None) -> int:
+    """Recompute every library configuration across `jobs` processes and
+    write them to `out`.  Returns the number of distinct plans stored.
+
+    Raises ValueError if any plan breaks a prerequisite (`unmet_prereqs`).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = [(str(csv), tuple(sorted(profile.items())), lo, hi, mode)
+             for csv in library_catalogs()
+             for profile in LIBRARY_AP_PROFILES
+             for lo, hi in LIBRARY_CREDIT_WINDOWS
+             for mode in LIBRARY_MODES]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        entries = list(pool.map(_library_entry, tasks, chunksize=8))
+
+    plans: Dict[tuple, list] = {}
+    for entry in entries:   # profiles granting the same courses share a plan
+        plans.setdefault((*entry[:2], tuple(entry[2]), *entry[3:6]), entry)
+
+    out = Path(out)
+    tmp = out.with_name(out.name + ".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump({"version": PLAN_LIBRARY_VERSION, "plans": list(plans.values())},
+                  f, separators=(",", ":"))
+    os.replace(tmp, out)
+    plan_library.cache_clear()
+    return len(plans)
+
+# --------------------------- demo / CLI ----------------------------
 if __name__ == "__main__":
-    demo_catalog = DATA_DIR / "computer_engineering_courses.csv"
-    sched, cr, df = build_plan(demo_catalog,
-                               {"Calculus BC": 5, "Chemistry": 5},
-                               12, 17, mode="var")
-    print(df)
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="4-year plan demo and plan library builder")
+    parser.add_argument("--build-library", action="store_true",
+                        help="precompute the plan library instead of printing a demo plan")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes for --build-library (default: all cores)")
+    parser.add_argument("--out", type=Path, default=PLAN_LIBRARY,
+                        help=f"library file to write (default: {PLAN_LIBRARY})")
+    args = parser.parse_args()
+
+    if args.build_library:
+        t0 = time.perf_counter()
+        n = build_library(args.out, args.jobs)
+        print(f"{n} plans written to {args.out} "
+              f"({args.out.stat().st_size / 1024:.1f} KiB) in {time.perf_counter() - t0:.1f}s")
+    else:
+        demo_catalog = DATA_DIR / "computer_engineering_courses.csv"
+        sched, cr, plan = build_plan(demo_catalog,
+                                     {"Calculus BC": 5, "Chemistry": 5},
+                                     12, 17, mode="var")
+        print(plan.to_string(index=False))
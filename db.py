@@ -0,0 +1,155 @@
+# db.py  – shared PostgreSQL connection pool for every page
+"""Process‑wide pooled database connections
+
+Use
+---
+    from db import get_connection
+
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(...)
+
+The block runs in one transaction: it commits on success and rolls back
+on an exception, then the connection goes back to the pool instead of
+being closed.  One pool is created per Streamlit server process
+(`st.cache_resource`) from the usual `db_*` secrets, plus optional
+
+* `db_pool_max`      most open connections (default 10)
+* `db_pool_timeout`  seconds to wait for a free connection (default 10)
+
+`pool_stats()` reports checkouts, connections opened, wait times,
+timeouts and discarded (dead or broken) connections.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+import psycopg2
+import streamlit as st
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.pool import PoolError
+
+DEFAULT_POOL_MAX = 10
+DEFAULT_POOL_TIMEOUT = 10.0
+HEALTHCHECK_AFTER = 30.0   # seconds idle before a connection is pinged
+
+
+class ConnectionPool:
+    """Bounded, health‑checked pool of psycopg2 connections.
+
+    Connections are opened lazily, at most `maxconn` at a time, and reused
+    most‑recently‑returned first.  Callers wait up to `timeout` seconds
+    for a free slot.  An idle connection is pinged before reuse if it has
+    sat unused for `HEALTHCHECK_AFTER` seconds, and replaced if dead.
+    """
+
+    def __init__(self, maxconn: int, timeout: float, **dsn):
+        self._dsn = dsn
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._timeout = timeout
+        self._maxconn = maxconn
+        self._idle: List[Tuple["psycopg2.extensions.connection", float]] = []
+        self._lock = threading.Lock()
+        self._stats = {"checkouts": 0, "in_use": 0, "opened": 0, "timeouts": 0,
+                       "discarded": 0, "wait_total_s": 0.0, "wait_max_s": 0.0}
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += n
+
+    @staticmethod
+    def _healthy(conn, last_used: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < HEALTHCHECK_AFTER:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                conn, last_used = self._idle.pop() if self._idle else (None, 0.0)
+            if conn is None:
+                conn = psycopg2.connect(**self._dsn)
+                self._count("opened")
+                return conn
+            if self._healthy(conn, last_used):
+                return conn
+            self._discard(conn)
+
+    def _checkin(self, conn) -> None:
+        if conn.closed or conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            self._discard(conn)
+            return
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+
+    def _discard(self, conn) -> None:
+        try:
+            conn.close()
+        finally:
+            self._count("discarded")
+
+    @contextmanager
+    def connection(self) -> Iterator["psycopg2.extensions.connection"]:
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self._timeout):
+            self._count("timeouts")
+            raise PoolError(f"no database connection free after {self._timeout:g}s")
+        waited = time.monotonic() - start
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["in_use"] += 1
+            self._stats["wait_total_s"] += waited
+            self._stats["wait_max_s"] = max(self._stats["wait_max_s"], waited)
+        conn = None
+        try:
+            conn = self._checkout()
+            with conn:   # commit on success, roll back on error
+                yield conn
+        finally:
+            if conn is not None:
+                self._checkin(conn)
+            self._count("in_use", -1)
+            self._slots.release()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {**self._stats, "idle": len(self._idle), "max_size": self._maxconn}
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+
+@st.cache_resource
+def _get_pool() -> ConnectionPool:
+    return ConnectionPool(
+        maxconn=int(st.secrets.get("db_pool_max", DEFAULT_POOL_MAX)),
+        timeout=float(st.secrets.get("db_pool_timeout", DEFAULT_POOL_TIMEOUT)),
+        host=st.secrets["db_host"],
+        port=st.secrets["db_port"],
+        dbname=st.secrets["db_name"],
+        user=st.secrets["db_user"],
+        password=st.secrets["db_password"],
+    )
+
+
+def get_connection():
+    """Context manager yielding a pooled connection (one transaction)."""
+    return _get_pool().connection()
+
+
+def pool_stats() -> Dict[str, float]:
+    return _get_pool().stats()
@@ -1,13 +1,14 @@
 import streamlit as st
 import psycopg2
-import bcrypt
-import base64
+
+from db import get_connection
+from assets import static_url, read_text
+from auth import hash_password, verify_password
 
 st.set_page_config(page_title="Gradient - Login", layout="wide", initial_sidebar_state="collapsed")
 
 def load_css():
-   with open("./style/style.css") as f:  # Make sure the path to your CSS is correct
-       st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+   st.markdown(f"<style>{read_text('style/style.css')}</style>", unsafe_allow_html=True)
 
 # hides the white space at the top (header)
 st.markdown("""
@@ -42,16 +43,6 @@ st.markdown(
 )
 # Now you can build the rest of your UI on top of that animated background
 
-# DB connection (No changes here)
-def get_connection():
-    return psycopg2.connect(
-        host=st.secrets["db_host"],
-        port=st.secrets["db_port"],
-        dbname=st.secrets["db_name"],
-        user=st.secrets["db_user"],
-        password=st.secrets["db_password"]
-    )
-
 @st.dialog(" ", width="large")
 def show_create_account_form():
     st.markdown(
@@ -78,7 +69,7 @@ def show_create_account_form():
     
     if email and username and password:
         if create_account:
-            hashed_pw = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+            hashed_pw = hash_password(password)
 
             try:
                 with get_connection() as conn:
@@ -119,10 +110,8 @@ with col2:
         unsafe_allow_html=True
     )
     # Logo
-    with open("logo.png", "rb") as logo_file:
-        encoded_logo = base64.b64encode(logo_file.read()).decode()
     st.markdown(
-        f'<img src="data:image/png;base64,{encoded_logo}" '
+        f'<img src="{static_url("logo.png")}" '
         "style='display:block; margin:0 auto 0rem; height:120px;'>",
         unsafe_allow_html=True,
     )
@@ -137,12 +126,26 @@ with col2:
     if st.button("Sign In"):
         with get_connection() as conn:
             cur = conn.cursor()
+            # Username or email, any case; an exact username match wins
             cur.execute(
-                "SELECT id, userPassword FROM UserAccount WHERE username = %s",
-                (username,),
+                """
+                SELECT id, userPassword FROM UserAccount
+                WHERE lower(username) = lower(%(login)s) OR lower(email) = lower(%(login)s)
+                ORDER BY username = %(login)s DESC, lower(username) = lower(%(login)s) DESC, id
+                LIMIT 1
+                """,
+                {"login": username.strip()},
             )
             result = cur.fetchone()
-        if result and bcrypt.checkpw(password.encode(), result[1].encode()):
+        # connection is back in the pool before the (slow) hash check;
+        # unknown users are checked against a dummy hash for equal timing
+        ok, new_hash = verify_password(password, result[1] if result else None)
+        if ok:
+            if new_hash:
+                with get_connection() as conn:
+                    cur = conn.cursor()
+                    cur.execute("UPDATE UserAccount SET userPassword = %s WHERE id = %s",
+                                (new_hash, result[0]))
             st.session_state["user_id"] = result[0]
             st.success("✅ Logged in successfully!")
             st.switch_page("pages/Profile.py")
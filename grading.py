@@ -0,0 +1,65 @@
+# grading.py  – SQI (0‑5) → score (0‑100) → letter grade, for whole columns
+"""Shared SQI grading used by every page
+
+    from grading import approx_score, letter_grades, add_grades
+
+* `approx_score`   cubic map of SQI onto 0‑100 (scalar, array or Series)
+* `letter_grades`  scores → (letters, colors) arrays via one `searchsorted`
+* `get_letter_grade` the same for a single score
+* `add_grades`     adds "Score", "Grade" and "Grade Color" columns to a
+                   frame once, when it is loaded and cached
+
+A missing score (NaN, or the legacy -1 sentinel) grades as ('', 'black').
+"""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# Cubic on [0,5] → [0,100], strictly increasing, with f(0)=0, f(5)=100,
+# fitted to sample points.  Highest power first, as np.polyval expects.
+SCORE_COEFFS = np.array([-1.26900567, 8.69005666, 8.27485836, 0.0])
+
+# score < GRADE_BREAKS[i] → GRADE_LETTERS[i]; anything ≥ 97 is an A+
+GRADE_BREAKS = np.array([60, 63, 67, 70, 73, 77, 80, 83, 87, 90, 93, 97], dtype=float)
+GRADE_LETTERS = np.array(["F", "D-", "D", "D+", "C-", "C", "C+",
+                          "B-", "B", "B+", "A-", "A", "A+"], dtype=object)
+GRADE_COLORS = np.array(["red"] + ["orange"] * 3
+                        + ["#DAA520"] * 3   # darker yellow for visibility
+                        + ["yellowgreen"] * 3 + ["limegreen"] * 3, dtype=object)
+NO_GRADE = ("", "black")
+
+
+def approx_score(sqi):
+    """SQI → 0‑100 score; keeps a Series' index, NaN stays NaN."""
+    if isinstance(sqi, pd.Series):
+        values = np.polyval(SCORE_COEFFS, pd.to_numeric(sqi).to_numpy(dtype=float))
+        return pd.Series(values, index=sqi.index, name=sqi.name)
+    return np.polyval(SCORE_COEFFS, sqi)
+
+
+def letter_grades(scores) -> Tuple[np.ndarray, np.ndarray]:
+    """Letters and colors for an array of 0‑100 scores."""
+    s = np.asarray(scores, dtype=float)
+    idx = np.searchsorted(GRADE_BREAKS, s, side="right")
+    letters = GRADE_LETTERS[idx]
+    colors = GRADE_COLORS[idx]
+    missing = np.isnan(s) | (s == -1)
+    letters[missing], colors[missing] = NO_GRADE
+    return letters, colors
+
+
+def get_letter_grade(score) -> Tuple[str, str]:
+    """(letter, color) for a single score."""
+    letters, colors = letter_grades([score])
+    return letters[0], colors[0]
+
+
+def add_grades(df: pd.DataFrame, sqi_col: str = "SQI") -> pd.DataFrame:
+    """Copy of `df` with "Score" (rounded to 2 places), "Grade" and
+    "Grade Color" computed from its SQI column."""
+    scores = approx_score(df[sqi_col].astype(float)).round(2)
+    letters, colors = letter_grades(scores)
+    return df.assign(Score=scores, Grade=letters, **{"Grade Color": colors})
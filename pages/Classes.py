@@ -1,18 +1,21 @@
 import streamlit as st
 import pandas as pd
-import psycopg2
-import base64
+import sys
+import time
+from pathlib import Path
 from streamlit_searchbox import st_searchbox
-from fuzzywuzzy import process
 import streamlit.components.v1 as components
 
-st.set_page_config(page_title="Gradient - Classes", page_icon=":tada:", layout="wide", initial_sidebar_state="expanded")
-def load_logo_as_base64(logo_path):
-    with open(logo_path, "rb") as logo_file:
-        encoded_logo = base64.b64encode(logo_file.read()).decode()
-    return encoded_logo
+# ─────────────── Add repo root to path ───────────────
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from db import get_connection
+from search_index import CourseIndex
+from grading import add_grades
+from assets import static_url, read_text
 
-logo_base64 = load_logo_as_base64("logo.png")
+st.set_page_config(page_title="Gradient - Classes", page_icon=":tada:", layout="wide", initial_sidebar_state="expanded")
+logo_url = static_url("logo.png")
 
 st.markdown(
     f"""
@@ -22,7 +25,7 @@ st.markdown(
             justify-content: center;  /* Center horizontally */
             align-items: center;      /* Center vertically */
             height: 150px;            /* Full viewport height */
-            background: url('data:image/png;base64,{logo_base64}') no-repeat center center; /* Set the image as background */
+            background: url('{logo_url}') no-repeat center center; /* Set the image as background */
             background-size: contain; /* Ensure the logo scales nicely */
             width: 100%;              /* Full width of the container */
            padding: 0;               /* Remove extra padding */
@@ -41,8 +44,7 @@ st.markdown(
 )
 
 def local_css(file_name):
-    with open(file_name) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    st.markdown(f"<style>{read_text(file_name)}</style>", unsafe_allow_html=True)
 
 local_css("style/style.css")
 
@@ -61,146 +63,181 @@ local_css("style/style.css")
 #             st.switch_page("pages/schedule.py")
 #     st.write("---")
 
-def get_connection():
-    return psycopg2.connect(
-        host=st.secrets["db_host"],
-        port=st.secrets["db_port"],
-        dbname=st.secrets["db_name"],
-        user=st.secrets["db_user"],
-        password=st.secrets["db_password"]
-    )
-
-def get_letter_grade(sqi):
-    if sqi == -1:
-        return '', 'black'
-    if sqi < 60:
-        return 'F', 'red'
-    if sqi < 63:
-        return 'D-', 'orange'
-    if sqi < 67:
-        return 'D', 'orange'
-    if sqi < 70:
-        return 'D+', 'orange'
-    if sqi < 73:
-        return 'C-', '#DAA520' # darker yellow for visibility
-    if sqi < 77:
-        return 'C', '#DAA520'
-    if sqi < 80:
-        return 'C+', '#DAA520'
-    if sqi < 83:
-        return 'B-', 'yellowgreen'
-    if sqi < 87:
-        return 'B', 'yellowgreen'
-    if sqi < 90:
-        return 'B+', 'yellowgreen'
-    if sqi < 93:
-        return 'A-', 'limegreen'
-    if sqi < 97:
-        return 'A', 'limegreen'
-    if sqi <= 100:
-        return 'A+', 'limegreen'
-    
-def approx_score(x):
-    """
-    Cubic on [0,5] → [0,100], strictly increasing,
-    with f(0)=0, f(5)=100, fitted to your sample points.
-    """
-    a, b, c = -1.26900567,  8.69005666, 8.27485836
-    return a*x**3 + b*x**2 + c*x
 
+# "cache": hold the whole Class/Teaches join per process (default)
+# "sql":   query one search / course at a time (needs sql/002 indexes)
+CLASS_LOOKUP_MODE = st.secrets.get("class_lookup_mode", "cache")
+SEARCH_LIMIT = 10
+TOP_PROFS = 5
 
-@st.cache_data(ttl=600)  # cache for 10 minutes
 def load_classes():
-    conn = get_connection()
-    cur = conn.cursor()
-
     query = """
     SELECT c.course_code, c.course_name, c.SQI
     FROM Class c
     """
-    cur.execute(query)
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(query)
+        rows = cur.fetchall()
+        cur.close()
 
-    return pd.DataFrame(rows, columns=["Course Code", "Course Name", "SQI"])
+    df = pd.DataFrame(rows, columns=["Course Code", "Course Name", "SQI"])
+    df["Course Code"] = df["Course Code"].str.strip()
+    return add_grades(df)
 
-@st.cache_data(ttl=600)  # cache for 10 minutes
 def load_teaches():
-    conn = get_connection()
-    cur = conn.cursor()
-
     query = """
     SELECT c.course_code, p.prof_name, p.sqi
     FROM Class c JOIN Teaches t ON c.id = t.class_id
     JOIN Professor p ON p.id = t.prof_id
     """
-    cur.execute(query)
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(query)
+        rows = cur.fetchall()
+        cur.close()
 
-    return pd.DataFrame(rows, columns=["Course Code", "Professor Name", "SQI"])
+    df = pd.DataFrame(rows, columns=["Course Code", "Professor Name", "SQI"])
+    df["Course Code"] = df["Course Code"].str.strip()
+    return add_grades(df)
+
+@st.cache_data(ttl=600)  # cache for 10 minutes
+def course_data_version():
+    """Load stamp for load_course_tables; a new one every 10 minutes."""
+    return time.time_ns()
+
+# One load of Class/Teaches builds the search index and both lookups
+# together, so they always agree about which courses exist.  Keyed by the
+# stamp above, a keystroke costs two small cache hits instead of
+# unpickling and hashing the frames.
+@st.cache_resource(max_entries=1)
+def load_course_tables(version, top_n=TOP_PROFS):
+    """Search index, course code → course rows, and course code → its
+    top_n professors by SQI."""
+    classes, teaches = load_classes(), load_teaches()
+    courses = {}
+    for row in classes.to_dict("records"):
+        courses.setdefault(row["Course Code"], []).append(row)
+
+    top_profs = {}
+    teaches = teaches.sort_values("SQI", ascending=False, kind="stable")
+    for code, group in teaches.groupby("Course Code", sort=False):
+        top_profs[code] = group.head(top_n).to_dict("records")
+    return CourseIndex.from_frame(classes), courses, top_profs
+
+def course_tables():
+    return load_course_tables(course_data_version())
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+@st.cache_data(ttl=600, max_entries=1024)
+def sql_search_classes(search_term, limit=SEARCH_LIMIT):
+    term = search_term.strip()
+    if not term:
+        return []
+    words = term.split()
+    # one ILIKE per word (not ILIKE ALL(array)) so each can use the
+    # course_name trigram index and the three branches combine in a BitmapOr
+    name_match = " AND ".join(f"c.course_name ILIKE %(word{i})s" for i in range(len(words)))
+    query = f"""
+    SELECT btrim(c.course_code) || ' - ' || c.course_name
+    FROM Class c
+    WHERE c.course_code ILIKE %(code)s
+       OR ({name_match})
+       OR c.course_name %% %(term)s
+    ORDER BY c.course_code ILIKE %(code)s DESC,
+             similarity(c.course_name, %(term)s) DESC,
+             c.course_code
+    LIMIT %(limit)s
+    """
+    params = {
+        "code": _like_escape(term) + "%",
+        "term": term,
+        "limit": limit,
+    }
+    params.update({f"word{i}": f"%{_like_escape(w)}%" for i, w in enumerate(words)})
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(query, params)
+        rows = cur.fetchall()
+        cur.close()
+
+    return [r[0] for r in rows]
+
+@st.cache_data(ttl=600, max_entries=1024)
+def sql_course_details(code, top_n=TOP_PROFS):
+    """Course rows for `code` and its top_n professors by SQI."""
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+        SELECT btrim(c.course_code), c.course_name, c.SQI
+        FROM Class c
+        WHERE btrim(c.course_code) = %s
+        """, (code,))
+        courses = pd.DataFrame(cur.fetchall(), columns=["Course Code", "Course Name", "SQI"])
+        cur.execute("""
+        SELECT p.prof_name, p.sqi
+        FROM Class c JOIN Teaches t ON c.id = t.class_id
+        JOIN Professor p ON p.id = t.prof_id
+        WHERE btrim(c.course_code) = %s
+        ORDER BY p.sqi DESC NULLS LAST
+        LIMIT %s
+        """, (code, top_n))
+        profs = pd.DataFrame(cur.fetchall(), columns=["Professor Name", "SQI"])
+        cur.close()
+
+    return add_grades(courses).to_dict("records"), add_grades(profs).to_dict("records")
+
+def search_courses(search_term: str):
+    if CLASS_LOOKUP_MODE == "sql":
+        return sql_search_classes(search_term)
+    course_index, _, _ = course_tables()
+    return course_index.search(search_term, limit=SEARCH_LIMIT)
+
+def course_details(code):
+    if CLASS_LOOKUP_MODE == "sql":
+        return sql_course_details(code)
+    _, courses_by_code, profs_by_code = course_tables()
+    return courses_by_code.get(code, []), profs_by_code.get(code, [])
 
 with st.container():
     st.title("Class Lookup",anchor=False)
 
-    df = load_classes()
-    teaches_df = load_teaches()
-    combined_courses = [f"{row['Course Code']} - {row['Course Name']}" for _, row in df.iterrows()]
-
-    def search_courses(search_term: str):
-        if not search_term:
-            return []
-
-        matches = process.extract(
-            search_term, 
-            combined_courses, 
-            limit=10
-        )
-        return [match[0] for match in matches]
-    
-    if len(df.index) != 0:
+    has_classes = CLASS_LOOKUP_MODE == "sql" or len(course_tables()[0]) != 0
+
+    if has_classes:
         with st.container(border=True):
             st.text("Search for your courses by name or code!")
-            # selected_course = st_searchbox(
-            #     search_courses, 
-            #     debounce=0,
-            #     key="class_search",
-            #     rerun_on_update=False,
-            #     placeholder="Search for a course...")
-            selected_course = st.selectbox(
-                label="Search up your courses and find their ratings!",
-                label_visibility="collapsed",
-                options=combined_courses,
-                index=None, # initially empty 
+            selected_course = st_searchbox(
+                search_courses,
+                debounce=0,
+                key="class_search",
+                rerun_on_update=False,
                 placeholder="Search for a course by name or code...")
 
         if selected_course:
             code, _ = selected_course.split("-", 1)
             code = code.strip()
 
-            sel = df[df["Course Code"].str.strip() == code]
-            teaches_sel = teaches_df[teaches_df["Course Code"].str.strip() == code].sort_values("SQI", ascending = False).head(5)
+            sel, teaches_sel = course_details(code)
 
-            if not sel.empty:
-                for _, row in sel.iterrows():
+            if sel:
+                for row in sel:
                     with st.container():
-                        sqi = round(approx_score(row['SQI']) if pd.notnull(row['SQI']) else -1, 2)
-                        letter_grade, color = get_letter_grade(sqi)
+                        sqi = row['Score'] if pd.notnull(row['Score']) else 'N/A'
 
                         top_profs = ""
-                        for _, prof in teaches_sel.iterrows():
-                            teaches_sqi = round(approx_score(prof["SQI"]) if pd.notnull(prof["SQI"]) else -1, 2)
-                            teaches_letter_grade, teaches_color = get_letter_grade(teaches_sqi)
-                            top_profs += f"{prof['Professor Name']}: <span style='color:{teaches_color}'>{teaches_letter_grade} ({teaches_sqi if teaches_sqi != -1 else 'N/A'})</span><br>"
+                        for prof in teaches_sel:
+                            teaches_sqi = prof['Score'] if pd.notnull(prof['Score']) else 'N/A'
+                            top_profs += f"{prof['Professor Name']}: <span style='color:{prof['Grade Color']}'>{prof['Grade']} ({teaches_sqi})</span><br>"
                         top_profs = "No professors found for this course" if len(top_profs) == 0 else top_profs
 
                         
                         components.html(f"""
                             <div style="background-color:#f5f5f5;padding:15px;border-radius:10px;margin-bottom:10px">
                                 <h2>{row['Course Code']} - {row['Course Name']}</h2>
-                                <p><strong>SQI: </strong><span style='color:{color}'>{letter_grade} ({sqi if sqi != -1 else 'N/A'})</span></p>
+                                <p><strong>SQI: </strong><span style='color:{row['Grade Color']}'>{row['Grade']} ({sqi})</span></p>
 
                                 <details style="margin-top:10px;">
                                 <summary style="font-weight:bold;cursor:pointer;">View Top Professors/TAs</summary>
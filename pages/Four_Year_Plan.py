@@ -1,21 +1,23 @@
 import streamlit as st
-import pandas as pd
 import psycopg2
+from psycopg2.extras import execute_values
 from pathlib import Path
 import sys
-import numpy as np
-import base64
 
 
 # ─────────────── Add repo root to path ───────────────
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 # ─────────────── Import scheduler ───────────────
-from course_scheduler import build_plan, DEFAULT_MIN_CR, DEFAULT_MAX_CR
+from course_scheduler import build_plan, ap_exams, plan_library, DEFAULT_MIN_CR, DEFAULT_MAX_CR
+from db import get_connection
+from grading import approx_score, letter_grades
+from assets import static_url, read_text
+
+plan_library()   # load the precomputed plans once per process, before the first request
 
 # ─────────────── Paths & Constants ───────────────
 DATA_DIR = Path(__file__).resolve().parents[1] / "4_Year_input_Data"
-AP_CREDIT_CSV = DATA_DIR / "rutgers_ap_credits.csv"
 
 MAJOR_CSV = {
     "Aerospace Engineering":                 "aerospace_engineering_courses.csv",
@@ -39,12 +41,7 @@ MAJOR_CSV_WK={"Computer Engineering":                  "computer_engineering_cou
 # ─────────────── Page setup ───────────────
 st.set_page_config(page_title="Gradient – Four‑Year Plan", page_icon=":tada:", layout="wide", initial_sidebar_state="expanded")
 
-def load_logo_as_base64(logo_path):
-    with open(logo_path, "rb") as logo_file:
-        encoded_logo = base64.b64encode(logo_file.read()).decode()
-    return encoded_logo
-
-logo_base64 = load_logo_as_base64("logo.png")
+logo_url = static_url("logo.png")
 
 st.markdown(
     f"""
@@ -54,7 +51,7 @@ st.markdown(
             justify-content: center;  /* Center horizontally */
             align-items: center;      /* Center vertically */
             height: 150px;            /* Full viewport height */
-            background: url('data:image/png;base64,{logo_base64}') no-repeat center center; /* Set the image as background */
+            background: url('{logo_url}') no-repeat center center; /* Set the image as background */
             background-size: contain; /* Ensure the logo scales nicely */
             width: 100%;              /* Full width of the container */
            padding: 0;               /* Remove extra padding */
@@ -74,8 +71,7 @@ st.markdown(
 
 # use CSS
 def local_css(file_name):
-    with open(file_name) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    st.markdown(f"<style>{read_text(file_name)}</style>", unsafe_allow_html=True)
 
 local_css("style/style.css")
 
@@ -124,24 +120,11 @@ with cr_col2:
     max_cr = st.number_input("Max Credits / Semester", value=DEFAULT_MAX_CR, min_value=min_cr, max_value=21)
 
 # ─────────────── AP Section ───────────────
-ap_catalog = pd.read_csv(AP_CREDIT_CSV, dtype=str)
-exams = sorted(ap_catalog["AP Exam"].unique())
-
 st.markdown("### Optional: Add AP Credits")
-chosen = st.multiselect("Select AP Exams", exams)
+chosen = st.multiselect("Select AP Exams", ap_exams())
 ap_scores = {exam: int(st.slider(f"{exam} score", 1, 5, 5, key=exam)) for exam in chosen}
 
 
-# DB connection function
-def get_connection():
-    return psycopg2.connect(
-        host=st.secrets["db_host"],
-        port=st.secrets["db_port"],
-        dbname=st.secrets["db_name"],
-        user=st.secrets["db_user"],
-        password=st.secrets["db_password"]
-    )
-
 # Save to DB logic
 if 'clicked' not in st.session_state:
     st.session_state.clicked = {1:False,2:False}
@@ -152,95 +135,144 @@ def clicked(button):
 build_btn = st.button("Build Plan", use_container_width=True, on_click=clicked, args=[1])
 
 
-def save_plan_to_db(df):
+def _plan_keys(rows):
+    """(year, semester, course, n) per row – n numbers repeats of a course in a term."""
+    seen = {}
+    for year, semester, course in rows:
+        base = (year, semester, course)
+        seen[base] = seen.get(base, -1) + 1
+        yield base + (seen[base],)
+
+
+def _same_entry(old, new):
+    # sqi is stored as REAL, so compare it with float tolerance
+    return old[:-1] == new[:-1] and abs(old[-1] - new[-1]) < 1e-4
+
+
+def diff_plan(stored, wanted):
+    """Compare the saved plan with the new one.
+
+    `stored` maps key -> (row id, payload) and `wanted` maps key -> payload.
+    Returns (inserts, deletes, updates): (key, payload) pairs to add, row
+    ids to drop and (row id, payload) pairs to rewrite in place.
+    """
+    inserts = [(key, payload) for key, payload in wanted.items() if key not in stored]
+    deletes = [row_id for key, (row_id, _) in stored.items() if key not in wanted]
+    updates = [
+        (row_id, wanted[key])
+        for key, (row_id, payload) in stored.items()
+        if key in wanted and (payload is None or not _same_entry(payload, wanted[key]))
+    ]
+    return inserts, deletes, updates
+
+
+def save_plan_to_db(plan):
+    """Bring the user's saved PlanCourse rows in line with `plan`.
+
+    Only changed rows are written.  Returns {"inserted", "deleted",
+    "updated", "unchanged"} counts, or None if nothing was saved.
+    """
     if "user_id" not in st.session_state:
         st.error("You must be logged in to save your plan.")
-        return
+        return None
+
+    user_id = st.session_state["user_id"]
+    rows = list(plan[["Semester", "Course Code", "Course Name", "Credits", "SQI"]].itertuples(index=False))
 
     try:
         with get_connection() as conn:
             cur = conn.cursor()
 
-            # Clear previous saved plan
-            cur.execute("DELETE FROM PlanCourse WHERE user_id = %s", (st.session_state["user_id"],))
-
-            total_inserted = 0
-
-            for sem_idx, column in enumerate(df.columns):
-                year = (sem_idx // 2) + 1
-                semester = "Fall" if sem_idx % 2 == 0 else "Spring"
-
-                for entry in df[column].dropna():
-                    display_str = entry.strip()
-                    course_code = None
-                    class_id = None
-
-                    try:
-                        # Try to get course_code like "332:231"
-                        parts = entry.split()
-                        if parts and ":" in parts[0]:
-                            course_code = parts[0]
-                            cur.execute("SELECT id FROM Class WHERE course_code = %s", (course_code,))
-                            result = cur.fetchone()
-                            if result:
-                                class_id = result[0]
-
-                        # Insert every instance — including duplicates
-                        cur.execute(
-                            """
-                            INSERT INTO PlanCourse (user_id, class_id, year, semester, course_display)
-                            VALUES (%s, %s, %s, %s, %s)
-                            """,
-                            (st.session_state["user_id"], class_id, year, semester, display_str)
-                        )
-                        total_inserted += 1
-
-                    except Exception as e:
-                        st.warning(f"⚠️ Could not save entry: {entry} — {e}")
-
-            conn.commit()
-            st.success(f"✅ Plan saved! {total_inserted} entries added.")
+            # Resolve every real course code (like "332:231") in one lookup
+            codes = sorted({code for _, code, _, _, _ in rows if ":" in code})
+            class_ids = {}
+            if codes:
+                cur.execute(
+                    """
+                    SELECT DISTINCT ON (course_code) course_code, id
+                    FROM Class WHERE course_code = ANY(%s)
+                    ORDER BY course_code, id
+                    """,
+                    (codes,),
+                )
+                class_ids = dict(cur.fetchall())
+
+            # payload: (class_id, course_display, course_name, credits, sqi)
+            entries = []
+            for sem_idx, course_code, course_name, credits, sqi in rows:
+                term = ((sem_idx // 2) + 1, "Fall" if sem_idx % 2 == 0 else "Spring")
+                display_str = f"{course_code} {course_name} ({credits} cr, SQI {sqi:.2f})"
+                entries.append((term + (course_code,), (class_ids.get(course_code), display_str,
+                                                        course_name, int(credits), float(sqi))))
+            wanted = dict(zip(_plan_keys(k for k, _ in entries), (p for _, p in entries)))
+
+            cur.execute(
+                """
+                SELECT id, year, semester, course_code, class_id, course_display,
+                       course_name, credits, sqi
+                FROM PlanCourse WHERE user_id = %s ORDER BY id
+                """,
+                (user_id,),
+            )
+            saved = cur.fetchall()
+            # Legacy rows sql/001 could not parse have no code or SQI; they
+            # never match and are replaced.
+            stored = {
+                key: (r[0], tuple(r[4:]) if r[3] is not None and r[8] is not None else None)
+                for key, r in zip(
+                    _plan_keys((r[1], r[2], r[3] or r[5]) for r in saved), saved
+                )
+            }
+
+            inserts, deletes, updates = diff_plan(stored, wanted)
+
+            if deletes:
+                cur.execute("DELETE FROM PlanCourse WHERE id = ANY(%s)", (deletes,))
+            if updates:
+                execute_values(
+                    cur,
+                    """
+                    UPDATE PlanCourse AS p
+                    SET class_id = v.class_id, course_display = v.course_display,
+                        course_name = v.course_name, credits = v.credits, sqi = v.sqi
+                    FROM (VALUES %s) AS v(id, class_id, course_display, course_name, credits, sqi)
+                    WHERE p.id = v.id
+                    """,
+                    [(row_id,) + payload for row_id, payload in updates],
+                    template="(%s, %s::integer, %s, %s, %s::integer, %s::real)",
+                    page_size=len(updates),
+                )
+            if inserts:
+                execute_values(
+                    cur,
+                    """
+                    INSERT INTO PlanCourse (user_id, class_id, year, semester, course_display,
+                                            course_code, course_name, credits, sqi)
+                    VALUES %s
+                    """,
+                    [(user_id, payload[0], year, semester, payload[1], course_code) + payload[2:]
+                     for (year, semester, course_code, _), payload in inserts],
+                    page_size=len(inserts),
+                )
+
+        # The Profile page caches the saved plan; make it reload
+        st.session_state.pop("profile_cache", None)
+
+        counts = {
+            "inserted": len(inserts),
+            "deleted": len(deletes),
+            "updated": len(updates),
+            "unchanged": len(stored) - len(deletes) - len(updates),
+        }
+        st.success(
+            f"✅ Plan saved! {counts['inserted']} added, {counts['updated']} updated, "
+            f"{counts['deleted']} removed, {counts['unchanged']} unchanged."
+        )
+        return counts
 
     except psycopg2.Error as e:
         st.error(f"❌ Database error: {e.pgerror}")
-
-def get_letter_grade(sqi):
-    if sqi == -1:
-        return '', 'black'
-    if sqi < 60:
-        return 'F', 'red'
-    if sqi < 63:
-        return 'D-', 'orange'
-    if sqi < 67:
-        return 'D', 'orange'
-    if sqi < 70:
-        return 'D+', 'orange'
-    if sqi < 73:
-        return 'C-', '#DAA520' # darker yellow for visibility
-    if sqi < 77:
-        return 'C', '#DAA520'
-    if sqi < 80:
-        return 'C+', '#DAA520'
-    if sqi < 83:
-        return 'B-', 'yellowgreen'
-    if sqi < 87:
-        return 'B', 'yellowgreen'
-    if sqi < 90:
-        return 'B+', 'yellowgreen'
-    if sqi < 93:
-        return 'A-', 'limegreen'
-    if sqi < 97:
-        return 'A', 'limegreen'
-    if sqi <= 100:
-        return 'A+', 'limegreen'
-
-def approx_score(x):
-    """
-    Cubic on [0,5] → [0,100], strictly increasing,
-    with f(0)=0, f(5)=100, fitted to your sample points.
-    """
-    a, b, c = -1.26900567,  8.69005666, 8.27485836
-    return a*x**3 + b*x**2 + c*x
+        return None
 
 # ─────────────── Generate Plan ───────────────
 
@@ -252,66 +284,48 @@ if st.session_state.clicked[1] and major in majors:
         st.error(f"Catalog file not found: **{csv_path}**")
         st.stop()
 
-    sched, sem_credits, df = build_plan(csv_path, ap_scores, min_cr=int(min_cr), max_cr=int(max_cr), mode="var")
+    sched, sem_credits, plan = build_plan(csv_path, ap_scores, min_cr=int(min_cr), max_cr=int(max_cr), mode="var")
 
     st.markdown(f"### Showing 4-Year Plan for **{major}**")
 
+    # Score every course and grade every term's average in one pass
+    scored = plan.assign(SQI=approx_score(plan["SQI"]))
+    term_avg = scored.groupby("Semester")["SQI"].mean()
+    letters, colors = letter_grades(term_avg.to_numpy())
+    term_grades = dict(zip(term_avg.index, zip(term_avg.to_numpy(), letters, colors)))
+
     for year in range(4):
         st.subheader(f"Year {year + 1}")
         col_fall, col_spring = st.columns(2)
         for sem_idx, col in zip((year * 2, year * 2 + 1), (col_fall, col_spring)):
             with col:
                 sem_name = f"Semester {sem_idx + 1}"
-                raw_rows = df[sem_name].replace("", pd.NA).dropna().tolist()
-
-                parsed = []
-                for entry in raw_rows:
-                    try:
-                        code, rest = entry.split(' ', 1)
-                        name, rest = rest.rsplit('(', 1)
-                        credits_part, sqi_part = rest.rstrip(')').split(', SQI ')
-                        credits = credits_part.strip().replace('cr', '').strip()
-                        sqi = approx_score(float(sqi_part.strip()))
-                        parsed.append({
-                            "Course Code": code.strip(),
-                            "Course Name": name.strip(),
-                            "Credits": int(credits),
-                            "SQI": sqi
-                        })
-                    except Exception:
-                        parsed.append({
-                            "Course Code": "",
-                            "Course Name": entry.strip(),
-                            "Credits": "",
-                            "SQI": ""
-                        })
-
-                parsed_df = pd.DataFrame(parsed)
-                parsed_df.columns = ["Course Code", "Course Name", "Credits", "SQI"]
+                sem_df = scored.loc[scored["Semester"] == sem_idx, ["Course Code", "Course Name", "Credits", "SQI"]]
 
                 st.markdown(f"**{sem_name}** — Total Credits: **{sem_credits[sem_idx]}**")
 
-                valid_sqis = [row["SQI"] for row in parsed if isinstance(row["SQI"], float)]
-                if valid_sqis:
-                    avg_sqi = sum(valid_sqis) / len(valid_sqis)
-                    letter_grade, color = get_letter_grade(avg_sqi)
+                if sem_idx in term_grades:
+                    avg_sqi, letter_grade, color = term_grades[sem_idx]
                     st.html(f"Average SQI: <strong style = \'color: {color}\'>{letter_grade} ({avg_sqi:.2f})</strong>")
                 else:
                     st.markdown("Average SQI: **N/A**")
 
-                st.dataframe(parsed_df.style.hide(axis="index").format({"SQI": "{:.2f}"}), hide_index=True, use_container_width=True)
+                st.dataframe(sem_df.style.hide(axis="index").format({"SQI": "{:.2f}"}), hide_index=True, use_container_width=True)
 
     # Download and Save buttons
     col_dl, col_save = st.columns([2, 1])
     with col_dl:
+        plan_csv = plan.assign(Year=plan["Semester"] // 2 + 1,
+                               Term=plan["Semester"].map(lambda s: "Fall" if s % 2 == 0 else "Spring"))
         st.download_button("Download Plan as CSV",
-                           data=df.to_csv(index=False).encode(),
+                           data=plan_csv[["Year", "Term", "Course Code", "Course Name", "Credits", "SQI"]]
+                                .to_csv(index=False).encode(),
                            file_name="four_year_plan.csv")
     with col_save:
         
         if st.session_state.get("build_btn"):
             if st.button("Save Plan to Account"):
-                save_plan_to_db(df)
+                save_plan_to_db(plan)
 
     
 elif build_btn:
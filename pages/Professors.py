@@ -1,18 +1,21 @@
 import streamlit as st
 import pandas as pd
-import psycopg2
-import base64
+import sys
+import time
+from pathlib import Path
 from streamlit_searchbox import st_searchbox
-from fuzzywuzzy import process
 
-st.set_page_config(page_title= "Gradient - Professors", page_icon=":tada:", layout ="wide", initial_sidebar_state="expanded")
+# ─────────────── Add repo root to path ───────────────
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from db import get_connection
+from search_index import ProfessorIndex
+from grading import add_grades
+from assets import static_url, read_text
 
-def load_logo_as_base64(logo_path):
-    with open(logo_path, "rb") as logo_file:
-        encoded_logo = base64.b64encode(logo_file.read()).decode()
-    return encoded_logo
+st.set_page_config(page_title= "Gradient - Professors", page_icon=":tada:", layout ="wide", initial_sidebar_state="expanded")
 
-logo_base64 = load_logo_as_base64("logo.png")
+logo_url = static_url("logo.png")
 
 st.markdown(
     f"""
@@ -22,7 +25,7 @@ st.markdown(
             justify-content: center;  /* Center horizontally */
             align-items: center;      /* Center vertically */
             height: 150px;            /* Full viewport height */
-            background: url('data:image/png;base64,{logo_base64}') no-repeat center center; /* Set the image as background */
+            background: url('{logo_url}') no-repeat center center; /* Set the image as background */
             background-size: contain; /* Ensure the logo scales nicely */
             width: 100%;              /* Full width of the container */
            padding: 0;               /* Remove extra padding */
@@ -40,8 +43,7 @@ st.markdown(
 )
 
 def local_css(file_name):
-    with open(file_name) as f :
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    st.markdown(f"<style>{read_text(file_name)}</style>", unsafe_allow_html=True)
 
 
 local_css("style/style.css")
@@ -65,52 +67,6 @@ local_css("style/style.css")
 
 #      st.write("---")
 
-def get_connection():
-    return psycopg2.connect(
-        host=st.secrets["db_host"],
-        port=st.secrets["db_port"],
-        dbname=st.secrets["db_name"],
-        user=st.secrets["db_user"],
-        password=st.secrets["db_password"]
-    )
-
-def get_letter_grade(sqi):
-    if sqi == -1:
-        return '', 'black'
-    if sqi < 60:
-        return 'F', 'red'
-    if sqi < 63:
-        return 'D-', 'orange'
-    if sqi < 67:
-        return 'D', 'orange'
-    if sqi < 70:
-        return 'D+', 'orange'
-    if sqi < 73:
-        return 'C-', '#DAA520' # darker yellow for visibility
-    if sqi < 77:
-        return 'C', '#DAA520'
-    if sqi < 80:
-        return 'C+', '#DAA520'
-    if sqi < 83:
-        return 'B-', 'yellowgreen'
-    if sqi < 87:
-        return 'B', 'yellowgreen'
-    if sqi < 90:
-        return 'B+', 'yellowgreen'
-    if sqi < 93:
-        return 'A-', 'limegreen'
-    if sqi < 97:
-        return 'A', 'limegreen'
-    if sqi <= 100:
-        return 'A+', 'limegreen'
-
-def approx_score(x):
-    """
-    Cubic on [0,5] → [0,100], strictly increasing,
-    with f(0)=0, f(5)=100, fitted to your sample points.
-    """
-    a, b, c = -1.26900567,  8.69005666, 8.27485836
-    return a*x**3 + b*x**2 + c*x
 
 def render_prof_card(row):
     name = row["Professor Name"]
@@ -139,13 +95,13 @@ def render_prof_card(row):
     )
 
     # 4) Then your existing card markup
-    sqi = round(approx_score(row["SQI"]) if pd.notnull(row["SQI"]) else -1, 2)
-    letter, color = get_letter_grade(sqi)
+    sqi = row["Score"] if pd.notnull(row["Score"]) else 'N/A'
+    letter, color = row["Grade"], row["Grade Color"]
     st.markdown(f"""
     <div style="background:#f5f5f5;padding:15px;border-radius:10px;margin-bottom:10px">
       <h5>{name}</h5>
       <strong>SQI:</strong>
-      <span style="color:{color}">{letter} ({sqi if sqi != -1 else 'N/A'})</span>
+      <span style="color:{color}">{letter} ({sqi})</span>
       <div style="margin-top:15px;padding:15px;
                   background:#f9f9f9;border-left:4px solid #bbb;
                   border-radius:8px">
@@ -159,64 +115,66 @@ def render_prof_card(row):
     """, unsafe_allow_html=True)
 
 
-@st.cache_data(ttl=600)  # cache for 10 minutes
 def load_professors():
-    conn = get_connection()
-    cur = conn.cursor()
-
     query = """
     SELECT prof_name, SQI, summary
     FROM professor
     """
-    cur.execute(query)
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(query)
+        rows = cur.fetchall()
+        cur.close()
 
-    return pd.DataFrame(rows, columns=["Professor Name", "SQI", "Summary"])
+    return add_grades(pd.DataFrame(rows, columns=["Professor Name", "SQI", "Summary"]))
+
+@st.cache_data(ttl=600)  # cache for 10 minutes
+def professor_data_version():
+    """Load stamp for load_professor_tables; a new one every 10 minutes."""
+    return time.time_ns()
+
+# The name lookup and the search index are built together from one load,
+# so a suggested or pinned name always has a card.
+@st.cache_resource(max_entries=1)
+def load_professor_tables(version):
+    """professor name → row (a repeated name keeps its first row), and the
+    search index over those names."""
+    lookup = {}
+    for row in load_professors().to_dict("records"):
+        lookup.setdefault(row["Professor Name"], row)
+    return lookup, ProfessorIndex(list(lookup))
 
 with st.container():
     if "pinned_profs" not in st.session_state:
         st.session_state.pinned_profs = []
     st.title("Professor Lookup",anchor=False)
     
-    df = load_professors()
-    prof_names = df["Professor Name"].tolist()
+    profs_by_name, prof_index = load_professor_tables(professor_data_version())
 
     def search_professors(search_term: str):
-        if not search_term:
-            return []
-        return [name for name, _ in process.extract(search_term, prof_names, limit=5)]
+        return prof_index.search(search_term, limit=5)
     
-    if len(df.index) != 0:
+    if len(profs_by_name) != 0:
         with st.container(border=True):
             st.text("Search up your professors and find their ratings!")
-            # selected_prof = st_searchbox(
-            #     search_professors,
-            #     debounce=0,
-            #     key="prof_search",
-            #     rerun_on_update=False,
-            #     placeholder="Search for a professor by name...")
-            selected_prof = st.selectbox(
-                label="Search up your professors and find their ratings!",
-                label_visibility="collapsed",
-                options=prof_names,
-                index=None, # initially empty 
+            selected_prof = st_searchbox(
+                search_professors,
+                debounce=0,
+                key="prof_search",
+                rerun_on_update=False,
                 placeholder="Search for a professor by name...")
 
-        # selected_prof = st_searchbox(search_professors, placeholder="Search for a Professor...")
-
         # 1) Always show pinned first
         if st.session_state.pinned_profs: 
             st.subheader("📌 Pinned Professors",anchor=None)
             for prof_name in st.session_state.pinned_profs.copy():
-                row = df[df["Professor Name"] == prof_name]
-                if not row.empty:
-                    render_prof_card(row.iloc[0])
+                row = profs_by_name.get(prof_name)
+                if row is not None:
+                    render_prof_card(row)
 
         # 2) Then show the current search hit (if any), but only if it’s not already pinned
         if selected_prof and selected_prof not in st.session_state.pinned_profs:
-            row = df[df["Professor Name"] == selected_prof]
-            if not row.empty:
+            row = profs_by_name.get(selected_prof)
+            if row is not None:
                 st.subheader("Search Result")
-                render_prof_card(row.iloc[0])
+                render_prof_card(row)
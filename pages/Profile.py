@@ -1,40 +1,69 @@
 import streamlit as st
-import psycopg2
 import pandas as pd
-import base64
-
+import sys
+from pathlib import Path
 
+# ─────────────── Add repo root to path ───────────────
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 # --- DB Connection ---
-def get_connection():
-    return psycopg2.connect(
-        host=st.secrets["db_host"],
-        port=st.secrets["db_port"],
-        dbname=st.secrets["db_name"],
-        user=st.secrets["db_user"],
-        password=st.secrets["db_password"]
-    )
+from db import get_connection
+from grading import approx_score, letter_grades
+from assets import static_url, read_text
 
 # --- Login Check ---
 if "user_id" not in st.session_state:
     st.error("🚫 You must be logged in to view this page.")
     st.stop()
 
-# --- Get Username ---
-with get_connection() as conn:
-    cur = conn.cursor()
-    cur.execute("SELECT username FROM UserAccount WHERE id = %s", (st.session_state["user_id"],))
-    result = cur.fetchone()
-    username = result[0] if result else "Unknown User"
+# --- Load Profile (cached per user in session state) ---
+def load_profile(user_id):
+    """Username, saved plan and per-term SQI grades for `user_id`.
+
+    Kept in st.session_state["profile_cache"] so reruns of this page don't
+    touch the database or regrade; the Four Year Plan page drops it after
+    a save.
+    """
+    cached = st.session_state.get("profile_cache")
+    if cached and cached["user_id"] == user_id:
+        return cached
+
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT username FROM UserAccount WHERE id = %s", (user_id,))
+        result = cur.fetchone()
+        cur.execute("""
+            SELECT year, semester, course_code, course_name, credits, sqi
+            FROM PlanCourse
+            WHERE user_id = %s
+            ORDER BY year, semester, id
+        """, (user_id,))
+        rows = cur.fetchall()
+
+    plan = pd.DataFrame(rows, columns=["Year", "Semester", "Course Code", "Course Name", "Credits", "SQI"])
+    plan["SQI"] = approx_score(pd.to_numeric(plan["SQI"]))
+    plan["Credits"] = plan["Credits"].astype("Int64")
+
+    # (year, semester) → (average SQI, letter, color); terms with no SQI are left out
+    term_avg = plan.groupby(["Year", "Semester"])["SQI"].mean().dropna()
+    letters, colors = letter_grades(term_avg.to_numpy())
+    term_grades = dict(zip(term_avg.index, zip(term_avg.to_numpy(), letters, colors)))
+
+    cached = {
+        "user_id": user_id,
+        "username": result[0] if result else "Unknown User",
+        "plan": plan,
+        "term_grades": term_grades,
+    }
+    st.session_state["profile_cache"] = cached
+    return cached
+
+profile = load_profile(st.session_state["user_id"])
+username = profile["username"]
 
 # --- Page Config & CSS ---
 st.set_page_config(page_title=f"Gradient - {username}'s Profile", page_icon=":tada:", layout="wide", initial_sidebar_state="expanded")
-def load_logo_as_base64(logo_path):
-    with open(logo_path, "rb") as logo_file:
-        encoded_logo = base64.b64encode(logo_file.read()).decode()
-    return encoded_logo
-
-logo_base64 = load_logo_as_base64("logo.png")
+logo_url = static_url("logo.png")
 
 st.markdown(
     f"""
@@ -44,7 +73,7 @@ st.markdown(
             justify-content: center;  /* Center horizontally */
             align-items: center;      /* Center vertically */
             height: 150px;            /* Full viewport height */
-            background: url('data:image/png;base64,{logo_base64}') no-repeat center center; /* Set the image as background */
+            background: url('{logo_url}') no-repeat center center; /* Set the image as background */
             background-size: contain; /* Ensure the logo scales nicely */
             width: 100%;              /* Full width of the container */
            padding: 0;               /* Remove extra padding */
@@ -82,8 +111,7 @@ st.markdown(
 
 # --- Load external style ---
 def local_css(file_name):
-    with open(file_name) as f:
-        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    st.markdown(f"<style>{read_text(file_name)}</style>", unsafe_allow_html=True)
 
 local_css("style/style.css")
 
@@ -159,104 +187,27 @@ with st.container():
 
     # st.write("---")
 
-def get_letter_grade(sqi):
-    if sqi == -1:
-        return '', 'black'
-    if sqi < 60:
-        return 'F', 'red'
-    if sqi < 63:
-        return 'D-', 'orange'
-    if sqi < 67:
-        return 'D', 'orange'
-    if sqi < 70:
-        return 'D+', 'orange'
-    if sqi < 73:
-        return 'C-', '#FFA600' # darker yellow for visibility
-    if sqi < 77:
-        return 'C', '#FFA600'
-    if sqi < 80:
-        return 'C+', '#FFA600'
-    if sqi < 83:
-        return 'B-', 'yellowgreen'
-    if sqi < 87:
-        return 'B', 'yellowgreen'
-    if sqi < 90:
-        return 'B+', 'yellowgreen'
-    if sqi < 93:
-        return 'A-', 'limegreen'
-    if sqi < 97:
-        return 'A', 'limegreen'
-    if sqi <= 100:
-        return 'A+', 'limegreen'
-
-def approx_score(x):
-    """
-    Cubic on [0,5] → [0,100], strictly increasing,
-    with f(0)=0, f(5)=100, fitted to your sample points.
-    """
-    a, b, c = -1.26900567,  8.69005666, 8.27485836
-    return a*x**3 + b*x**2 + c*x
-
 with st.expander('4-Year Plan'):
     st.markdown(f"### My 4-Year Plan")
-    with get_connection() as conn:
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT year, semester, course_display
-            FROM PlanCourse
-            WHERE user_id = %s
-            ORDER BY year, semester, id
-        """, (st.session_state["user_id"],))
-        rows = cur.fetchall()
+    plan = profile["plan"]
 
-    if not rows:
+    if plan.empty:
         st.info("No saved plan found. Go to the Four Year Plan tab to generate one.")
     else:
-        # Organize by year and semester
-        plan = { (year, semester): [] for year in range(1, 5) for semester in ("Fall", "Spring") }
-        for year, semester, display in rows:
-            plan[(year, semester)].append(display)
-
         for year in range(1, 5):
             st.subheader(f"Year {year}")
             col_fall, col_spring = st.columns(2)
             for semester, col in zip(("Fall", "Spring"), (col_fall, col_spring)):
                 with col:
-                    sem_courses = plan[(year, semester)]
+                    df = plan.loc[(plan["Year"] == year) & (plan["Semester"] == semester),
+                                  ["Course Code", "Course Name", "Credits", "SQI"]]
                     st.markdown(f"**{semester}**")
 
-                    if not sem_courses:
+                    if df.empty:
                         st.write("_No courses scheduled._")
                     else:
-                        parsed = []
-                        for entry in sem_courses:
-                            try:
-                                code, rest = entry.split(' ', 1)
-                                name, rest = rest.rsplit('(', 1)
-                                credits_part, sqi_part = rest.rstrip(')').split(', SQI ')
-                                credits = credits_part.strip().replace('cr', '').strip()
-                                sqi = approx_score(float(sqi_part.strip()))
-                                parsed.append({
-                                    "Course Code": code.strip(),
-                                    "Course Name": name.strip(),
-                                    "Credits": int(credits),
-                                    "SQI": sqi
-                                })
-                            except Exception:
-                                parsed.append({
-                                    "Course Code": "",
-                                    "Course Name": entry.strip(),
-                                    "Credits": "",
-                                    "SQI": None
-                                })
-
-                        df = pd.DataFrame(parsed)
-                        df = df[["Course Code", "Course Name", "Credits", "SQI"]]
-
-                        valid_sqis = [row["SQI"] for row in parsed if isinstance(row["SQI"], float)]
-                        if valid_sqis:
-                            avg_sqi = sum(valid_sqis) / len(valid_sqis)
-                            letter_grade, color = get_letter_grade(avg_sqi)
+                        if (year, semester) in profile["term_grades"]:
+                            avg_sqi, letter_grade, color = profile["term_grades"][(year, semester)]
                             st.html(f"Average SQI: <strong style = \'color: {color}\'>{letter_grade} ({avg_sqi:.2f})</strong>")
                         else:
                             st.markdown("Average SQI: **N/A**")
@@ -1,15 +1,13 @@
 import streamlit as st
 import psycopg2
-import bcrypt
+import sys
+from pathlib import Path
 
-def get_connection():
-    return psycopg2.connect(
-        host=st.secrets["db_host"],
-        port=st.secrets["db_port"],
-        dbname=st.secrets["db_name"],
-        user=st.secrets["db_user"],
-        password=st.secrets["db_password"]
-    )
+# ─────────────── Add repo root to path ───────────────
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from db import get_connection
+from auth import hash_password
 
 # Hide the sidebar on this page
 st.set_page_config(page_title="Create Account", layout="centered", initial_sidebar_state="collapsed")
@@ -24,7 +22,7 @@ if st.button("Create Account"):
     if not email or not username or not password:
         st.error("Please fill in all fields.")
     else:
-        hashed_pw = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+        hashed_pw = hash_password(password)
 
         try:
             with get_connection() as conn:
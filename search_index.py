@@ -0,0 +1,307 @@
+# search_index.py  – in‑memory type‑ahead indexes for the lookup pages
+"""Precomputed search over the course catalogue
+
+Built once per data load (the pages cache it with `st.cache_resource`),
+then every keystroke of the `st_searchbox` type‑ahead is answered from
+dictionaries instead of a fuzzy scan over every label.
+
+Matches are ranked in tiers
+
+1. course code  – "332:231", "14:332:231", "332231", "332 23", "231"
+   (prefix of the full code or of the course number)
+2. words        – every query word is a prefix of some word of the
+   course name, e.g. "dig log" → "Digital Logic Design"
+3. typos        – trigram similarity, e.g. "thermodinamics"
+
+Benchmark:  python search_index.py [path/to/master_sqi.csv]
+"""
+from __future__ import annotations
+
+import heapq
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+from fuzzywuzzy import fuzz
+
+NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+DEFAULT_LIMIT = 10
+MIN_TRIGRAM_SCORE = 0.2   # Jaccard floor for typo matches
+
+
+def normalize(text: str) -> str:
+    """Lower‑case, punctuation to spaces, collapsed whitespace."""
+    return NON_ALNUM_RE.sub(" ", str(text).lower()).strip()
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Character trigrams of each word, padded so short words still count."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _prefixes(word: str) -> Iterable[str]:
+    return (word[:i] for i in range(1, len(word) + 1))
+
+
+class _TrigramIndex:
+    """Posting lists gram → entry ids, scored by Jaccard overlap."""
+
+    def __init__(self, texts: Iterable[str]):
+        postings: Dict[str, List[int]] = defaultdict(list)
+        self._gram_count: List[int] = []
+        for i, text in enumerate(texts):
+            grams = trigrams(text)
+            for g in grams:
+                postings[g].append(i)
+            self._gram_count.append(len(grams))
+        self._postings = {g: tuple(ix) for g, ix in postings.items()}
+
+    def scores(self, query: str, floor: float = MIN_TRIGRAM_SCORE) -> List[Tuple[float, int]]:
+        grams = trigrams(query)
+        if not grams:
+            return []
+        overlap = Counter()
+        for g in grams:
+            overlap.update(self._postings.get(g, ()))
+        scored = []
+        for i, n in overlap.items():
+            score = n / (len(grams) + self._gram_count[i] - n)
+            if score >= floor:
+                scored.append((score, i))
+        return scored
+
+
+class CourseIndex:
+    """Top‑k course search by code, name‑word prefix and trigram overlap.
+
+    `labels` are "code - name" strings in input order; `search` returns
+    a subset of them.
+    """
+
+    def __init__(self, codes: Sequence[str], names: Sequence[str]):
+        self.labels: List[str] = [f"{c} - {n}" for c, n in zip(codes, names)]
+        self._name_len: List[int] = [len(str(n)) for n in names]
+
+        code_prefix: Dict[str, set] = defaultdict(set)
+        word_prefix: Dict[str, set] = defaultdict(set)
+        gram_texts: List[str] = []
+
+        for i, (code, name) in enumerate(zip(codes, names)):
+            digits = "".join(normalize(code).split())        # "332:231" → "332231"
+            number = normalize(code).split()[-1] if digits else ""
+            for p in set(_prefixes(digits)) | set(_prefixes(number)):
+                code_prefix[p].add(i)
+
+            words = normalize(name).split()
+            for word in words:
+                for p in _prefixes(word):
+                    word_prefix[p].add(i)
+
+            gram_texts.append(" ".join(words) + " " + digits)
+
+        self._code_prefix = {p: frozenset(ix) for p, ix in code_prefix.items()}
+        self._word_prefix = {p: frozenset(ix) for p, ix in word_prefix.items()}
+        self._grams = _TrigramIndex(gram_texts)
+
+    @classmethod
+    def from_frame(cls, df, code_col: str = "Course Code", name_col: str = "Course Name") -> "CourseIndex":
+        return cls(df[code_col].astype(str).str.strip().tolist(),
+                   df[name_col].astype(str).str.strip().tolist())
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def _by_words(self, words: List[str]) -> FrozenSet[int]:
+        hits = None
+        for word in words:
+            ix = self._word_prefix.get(word, frozenset()) | self._code_prefix.get(word, frozenset())
+            hits = ix if hits is None else hits & ix
+            if not hits:
+                return frozenset()
+        return hits or frozenset()
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[str]:
+        q = normalize(query)
+        if not q or limit <= 0:
+            return []
+
+        ranked: List[int] = []
+        seen = set()
+
+        def take(ids: Iterable[int]) -> bool:
+            for i in ids:
+                if i not in seen:
+                    seen.add(i)
+                    ranked.append(i)
+                    if len(ranked) >= limit:
+                        return True
+            return False
+
+        # 1) code: "332:231" / "332 231" / "332231" / "231"; a leading
+        #    school number ("14:332:231") is dropped
+        words = q.split()
+        digits = "".join(words[-2:] if len(words) > 2 else words)
+        if digits.isdigit():
+            code_hits = self._code_prefix.get(digits, frozenset())
+            if take(sorted(code_hits, key=lambda i: (self.labels[i], i))):
+                return [self.labels[i] for i in ranked]
+
+        # 2) every word is a prefix of a name word (or the code)
+        word_hits = self._by_words(words)
+        if take(sorted(word_hits, key=lambda i: (self._name_len[i], self.labels[i]))):
+            return [self.labels[i] for i in ranked]
+
+        # 3) typo tolerant fallback
+        typo_hits = sorted(self._grams.scores(q), key=lambda t: (-t[0], self.labels[t[1]]))
+        take(i for _, i in typo_hits)
+        return [self.labels[i] for i in ranked]
+
+
+class ProfessorIndex:
+    """Top‑k professor name search.
+
+    Candidates are names where every query word (in any order, so "smith j"
+    and "john sm" both work) prefixes a name word – at most
+    `PREFIX_CANDIDATES` of them, shortest names first.  Only when fewer
+    than `limit` names match that way are the best `TRIGRAM_CANDIDATES`
+    trigram matches added for misspellings; that pass walks the posting
+    list of every query trigram, so a misspelt query costs time in
+    proportion to the names sharing its trigrams.  The short candidate list
+    is rescored with `fuzz.token_sort_ratio`; prefix matches rank first,
+    and among them a last‑name match beats a first‑name one.
+    """
+
+    PREFIX_CANDIDATES = 10
+    TRIGRAM_CANDIDATES = 10
+
+    def __init__(self, names: Sequence[str]):
+        self.names: List[str] = list(names)
+        self._norm: List[str] = []
+        words_of: List[List[str]] = []
+        for name in self.names:
+            raw = str(name)
+            if "," in raw:                        # "Last, First Middle"
+                last_part, _, first_part = raw.partition(",")
+                raw = f"{first_part} {last_part}"
+            words = normalize(raw).split()
+            words_of.append(words)
+            self._norm.append(" ".join(words))
+
+        # ids in rank order so the first few prefix hits are the best ones
+        ranked = sorted(range(len(self.names)), key=lambda i: (len(self._norm[i]), self._norm[i], i))
+        first: Dict[str, List[int]] = defaultdict(list)
+        last: Dict[str, List[int]] = defaultdict(list)
+        any_word: Dict[str, List[int]] = defaultdict(list)
+        for i in ranked:
+            words = words_of[i]
+            for pos, word in enumerate(words):
+                for p in _prefixes(word):
+                    if pos == 0:
+                        first[p].append(i)
+                    if pos == len(words) - 1:
+                        last[p].append(i)
+                    if not any_word[p] or any_word[p][-1] != i:
+                        any_word[p].append(i)
+
+        self._first = {p: frozenset(ix) for p, ix in first.items()}
+        self._last = {p: frozenset(ix) for p, ix in last.items()}
+        self._ranked = {p: tuple(ix) for p, ix in any_word.items()}
+        self._members = {p: frozenset(ix) for p, ix in any_word.items()}
+        self._grams = _TrigramIndex(self._norm)
+
+    @classmethod
+    def from_frame(cls, df, name_col: str = "Professor Name") -> "ProfessorIndex":
+        return cls(df[name_col].astype(str).str.strip().tolist())
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _by_prefix(self, words: List[str]) -> List[int]:
+        if any(w not in self._ranked for w in words):
+            return []
+        words = sorted(words, key=lambda w: len(self._ranked[w]))
+        rest = [self._members[w] for w in words[1:]]
+        hits = []
+        for i in self._ranked[words[0]]:
+            if all(i in ix for ix in rest):
+                hits.append(i)
+                if len(hits) >= self.PREFIX_CANDIDATES:
+                    break
+        return hits
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[str]:
+        q = normalize(query)
+        if not q or limit <= 0:
+            return []
+
+        words = q.split()
+        prefix_hits = set(self._by_prefix(words))
+        candidates = set(prefix_hits)
+        # prefix matches always rank first, so typo candidates only matter
+        # when there are fewer than `limit` of them
+        if len(prefix_hits) < limit:
+            typo_hits = heapq.nlargest(self.TRIGRAM_CANDIDATES, self._grams.scores(q))
+            candidates.update(i for _, i in typo_hits)
+        last = [self._last[w] for w in words if w in self._last]
+
+        scored = sorted(
+            ((i in prefix_hits, any(i in ix for ix in last),
+              fuzz.token_sort_ratio(q, self._norm[i]), -i) for i in candidates),
+            reverse=True,
+        )
+        return [self.names[-neg_i] for *_, neg_i in scored[:limit]]
+
+
+# ────────────────────────────────── demo / benchmark ─────────────
+if __name__ == "__main__":
+    import sys
+    import time
+
+    import pandas as pd
+
+    csv = Path(sys.argv[1]) if len(sys.argv) > 1 else \
+        Path(__file__).resolve().parent / "4_Year_input_Data" / "master_sqi.csv"
+    df = pd.read_csv(csv)
+
+    t0 = time.perf_counter()
+    index = CourseIndex.from_frame(df)
+    build_ms = (time.perf_counter() - t0) * 1e3
+    print(f"{len(index)} courses indexed in {build_ms:.1f} ms")
+
+    queries = ["332", "332:23", "14:332:231", "calc", "dig log", "intro to",
+               "thermodinamics", "organic chem", "linear algebra", "phys", "xyz"]
+    reps = 2000
+    for q in queries:
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            hits = index.search(q)
+        us = (time.perf_counter() - t0) / reps * 1e6
+        print(f"{q!r:>18}  {us:8.1f} µs  {len(hits):2d} hits  {hits[:2]}")
+
+    # professors: synthetic names at the scale of the full faculty list
+    import random
+
+    rng = random.Random(0)
+    first = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+             "Wei", "Priya", "Ahmed", "Olga", "Carlos", "Mei", "Sanjay", "Elena"]
+    last = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+            "Rodriguez", "Martinez", "Chen", "Patel", "Kim", "Nguyen", "Kowalski", "Rossi"]
+    names = [f"{rng.choice(first)} {rng.choice(last)}{'' if k < 256 else k}" for k in range(5000)]
+
+    t0 = time.perf_counter()
+    profs = ProfessorIndex(names)
+    build_ms = (time.perf_counter() - t0) * 1e3
+    print(f"\n{len(profs)} professors indexed in {build_ms:.1f} ms")
+
+    reps = 200
+    for q in ["j", "smi", "john sm", "chen w", "garcai", "patel priya", "zzz"]:
+        t0 = time.perf_counter()
+        for _ in range(reps):
+            hits = profs.search(q, limit=5)
+        us = (time.perf_counter() - t0) / reps * 1e6
+        print(f"{q!r:>18}  {us:8.1f} µs  {len(hits):2d} hits  {hits[:2]}")
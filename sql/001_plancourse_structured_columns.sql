@@ -0,0 +1,24 @@
+-- Store saved plan courses as structured columns so pages never have to
+-- parse course_display ("CODE Name (N cr, SQI x.xx)") back apart.
+ALTER TABLE PlanCourse
+    ADD COLUMN IF NOT EXISTS course_code TEXT,
+    ADD COLUMN IF NOT EXISTS course_name TEXT,
+    ADD COLUMN IF NOT EXISTS credits     INTEGER,
+    ADD COLUMN IF NOT EXISTS sqi         REAL;
+
+-- One-time backfill of rows saved before the columns existed, parsed from
+-- their display text.  Text in any other shape gets an empty code and is
+-- shown whole as the name, with no credits or SQI.
+UPDATE PlanCourse p
+SET course_code = coalesce(parsed.m[1], ''),
+    course_name = coalesce(parsed.m[2], p.course_display),
+    credits     = parsed.m[3]::integer,
+    sqi         = parsed.m[4]::real
+FROM (
+    SELECT id,
+           regexp_match(course_display,
+                        '^(\S+) (.*) \((\d+) cr, SQI ([0-9.]+)\)$') AS m
+    FROM PlanCourse
+    WHERE course_code IS NULL
+) AS parsed
+WHERE p.id = parsed.id;
@@ -0,0 +1,24 @@
+-- Indexes for the Classes page's query-on-demand mode
+-- (class_lookup_mode = "sql" in secrets), which searches and loads one
+-- course at a time instead of caching the whole Class/Teaches join.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- type-ahead: course_code ILIKE 'term%', one course_name ILIKE '%word%'
+-- per query word (ANDed), and course_name % 'term' ranked by similarity().
+-- All three branches are index conditions, so the OR is answered with a
+-- BitmapOr of these two indexes instead of a sequential scan.
+CREATE INDEX IF NOT EXISTS class_course_code_trgm_idx
+    ON Class USING gin (course_code gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS class_course_name_trgm_idx
+    ON Class USING gin (course_name gin_trgm_ops);
+
+-- course detail: exact lookup on the trimmed code the page displays
+CREATE INDEX IF NOT EXISTS class_course_code_idx
+    ON Class (btrim(course_code)) INCLUDE (id, course_name, SQI);
+
+-- top professors per course: walk Teaches by class without heap visits,
+-- then fetch name and SQI from the professor index alone
+CREATE INDEX IF NOT EXISTS teaches_class_prof_idx
+    ON Teaches (class_id, prof_id);
+CREATE INDEX IF NOT EXISTS professor_id_sqi_idx
+    ON Professor (id) INCLUDE (prof_name, SQI);
@@ -0,0 +1,8 @@
+-- Sign-in accepts a username or an email, in any letter case, with a
+-- single query: lower(username) = lower($1) OR lower(email) = lower($1).
+-- These expression indexes let Postgres answer it with a BitmapOr of two
+-- index scans instead of a sequential scan of UserAccount.
+CREATE INDEX IF NOT EXISTS useraccount_lower_username_idx
+    ON UserAccount (lower(username));
+CREATE INDEX IF NOT EXISTS useraccount_lower_email_idx
+    ON UserAccount (lower(email));